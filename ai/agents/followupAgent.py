@@ -1,51 +1,75 @@
-import os
 import json
-import httpx
+import time
+import logging
 
-from back.db.allMeetFunctions import getMeet, getQuestionAsked
-from back.db.utils.messages import putMessage
+from ai.llmClient import chat, LLM_MODEL
+from ai.scheduler import LLMBusyError, INTERACTIVE
+from ai.prompts import currentPrompt
+from ai.verdictCache import verdictCache, VERDICT_CACHE_ENABLED
+from ai.prefilter import prefilter, recordDecision, ACCEPT, REJECT, FOLLOWUP_PROMPT
+from back.db.allMeetFunctions import getQuestionAsked
+from back.db.meetState import MeetState
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROMPT_PATH = os.path.join(BASE_DIR, "..", "prompts", "followupAgent.txt")
+logger = logging.getLogger(__name__)
 
-with open(PROMPT_PATH, "r", encoding="utf-8") as f:
-    PROMPT_TEMPLATE = f.read()
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {"type": "string", "enum": ["followup_needed", "no_followup_needed"]},
+        "message": {"type": "string"}
+    },
+    "required": ["status", "message"]
+}
 
-async def followUp(meetID, question: str, answer: str):
-    print(f"[FOLLOWUP] Function called", flush=True)
-    meet = getMeet(meetID)
-    question_number = getQuestionAsked(meet)
-    print(f"[FOLLOWUP] Question number: {question_number}", flush=True)
+async def followUp(state: MeetState, question: str, answer: str):
+    question_number = getQuestionAsked(state.meet)
     
     if question_number > 2:
-        print(f"\n[FOLLOWUP] Checking if follow-up is needed...\n", flush=True)
-        print(f"[FOLLOWUP] Question: {question}", flush=True)
-        print(f"[FOLLOWUP] Answer: {answer}", flush=True)
+        logger.debug("Checking follow-up for question %s: %s", question_number, question)
 
-        prompt = (
-            PROMPT_TEMPLATE
-            .replace("<question>", question)
-            .replace("<answer>", answer)
-        )
+        # One follow-up per question: asking again would loop on a candidate who cannot answer
+        if question == FOLLOWUP_PROMPT or state.followup_asked:
+            logger.debug("Already followed up, moving on")
+            return {
+                "status": "no_followup_needed",
+                "message": "The answer is sufficient to proceed."
+            }
+
+        # Clear-cut answers are decided locally; only ambiguous ones reach the LLM.
+        # The question is passed so fluent but off-topic answers are not waved through
+        decision, reason = prefilter("followup", answer, question=question)
+        if decision == REJECT:
+            logger.debug("Prefilter asked for follow-up (%s)", reason)
+            return {
+                "status": "followup_needed",
+                "message": FOLLOWUP_PROMPT
+            }
+        if decision == ACCEPT:
+            logger.debug("Prefilter skipped follow-up (%s)", reason)
+            return {
+                "status": "no_followup_needed",
+                "message": "The answer is sufficient to proceed."
+            }
+
+        user_message = f"Question: {question}\nAnswer: {answer}"
 
-        print(f"[FOLLOWUP] Sending request to Ollama...", flush=True)
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            res = await client.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "llama3.1:8b",
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-        print(f"[FOLLOWUP] Ollama response status: {res.status_code}", flush=True)
+        start = time.perf_counter()
+        system_prompt, prompt_version = currentPrompt("followupAgent.txt")
+        cache_key = verdictCache.key("followup", LLM_MODEL, prompt_version, question, answer)
+        if VERDICT_CACHE_ENABLED:
+            cached = await verdictCache.get("followup", cache_key)
+            if cached:
+                recordDecision("followup", "cache", cached["status"], time.perf_counter() - start)
+                return cached
 
         try:
-            data = res.json()
-            raw_text = (data.get("response") or "").strip()
-            print(f"[FOLLOWUP] Raw LLM response: {raw_text[:200]}", flush=True)
+            raw_text = (await chat("followupAgent", system_prompt, user_message, timeout=60.0, format=VERDICT_SCHEMA, priority=INTERACTIVE)).strip()
+        except LLMBusyError:
+            # Overload is reported to the candidate by the turn, not as a bad answer
+            raise
         except Exception as e:
-            print(f"[FOLLOWUP] Failed to parse Ollama response: {e}", flush=True)
+            logger.warning("Follow-up call failed: %s", e)
+            recordDecision("followup", "llm", "error", time.perf_counter() - start)
             return {
                 "status": "failed",
                 "message": "Internal follow-up check error. Please answer again."
@@ -53,10 +77,9 @@ async def followUp(meetID, question: str, answer: str):
 
         try:
             parsed = json.loads(raw_text)
-            print(f"[FOLLOWUP] Parsed JSON: {parsed}", flush=True)
         except Exception as e:
-            print(f"[FOLLOWUP] RAW FOLLOWUP AGENT OUTPUT: {raw_text}", flush=True)
-            print(f"[FOLLOWUP] JSON parse error: {e}", flush=True)
+            logger.warning("Follow-up output is not JSON (%s): %s", e, raw_text)
+            recordDecision("followup", "llm", "error", time.perf_counter() - start)
             return {
                 "status": "failed",
                 "message": "Internal follow-up check error. Please answer again."
@@ -64,26 +87,25 @@ async def followUp(meetID, question: str, answer: str):
 
         status = parsed.get("status")
         message = parsed.get("message")
+        recordDecision("followup", "llm", str(status), time.perf_counter() - start)
 
         if status not in ("followup_needed", "no_followup_needed") or not isinstance(message, str):
-            print(f"[FOLLOWUP] INVALID FOLLOWUP AGENT JSON: {parsed}", flush=True)
+            logger.warning("Invalid follow-up verdict: %s", parsed)
             return {
                 "status": "failed",
                 "message": "Internal follow-up check error. Please answer again."
             }
 
-        print(f"\n[FOLLOWUP] Follow-up Check Done\n", flush=True)
-        print(f"[FOLLOWUP] Status: {status}", flush=True)
-        print(f"[FOLLOWUP] Message: {message}", flush=True)
+        logger.debug("Follow-up check done: %s (%s)", status, message)
 
-        putMessage(meetID, message, "Jarvis")
+        if VERDICT_CACHE_ENABLED:
+            await verdictCache.put(cache_key, {"status": status, "message": message})
 
         return {
             "status": status,
             "message": message
         }
     else:
-        print(f"[FOLLOWUP] Skipping (question_number <= 2)", flush=True)
         return {
             "status": "no_followup_needed",
             "message": "The answer is sufficient to proceed."
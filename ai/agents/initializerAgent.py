@@ -1,59 +1,82 @@
-import os
+import re
 import json
-import requests
+import logging
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROMPT_PATH = os.path.join(BASE_DIR, "..", "prompts", "initializerAgent.txt")
+from ai.llmClient import chat
+from ai.prompts import currentPrompt
 
-with open(PROMPT_PATH, "r", encoding="utf-8") as f:
-    PROMPT_TEMPLATE = f.read()
+logger = logging.getLogger(__name__)
 
-def getTopicsForInterview():
+FALLBACK_TOPICS = {
+    "technical_topics": [
+        "Convolutional Neural Network Architecture - easy",
+        "Redis In-Memory Data Store - medium",
+        "Kubernetes Cluster Management - medium",
+        "Hash Table Collision Resolution - medium",
+        "Graph-Based Recommendation Systems - easy"
+    ],
+    "dsa_questions": [
+        "0/1 Knapsack Problem - medium",
+        "Tower of Hanoi Algorithm - easy",
+        "Minimum Window Substring - medium"
+    ]
+}
 
-    # print(PROMPT_TEMPLATE)
+TOPIC_PATTERN = re.compile(r"^.+ - (easy|medium)$")
 
-    res = requests.post(
-        "http://localhost:11434/api/generate",
-        json={
-            "model": "llama3.1:8b",
-            "prompt": PROMPT_TEMPLATE,
-            "stream": True
-        },
-        stream=True,
-        timeout=120
-    )
+TOPICS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "technical_topics": {"type": "array", "items": {"type": "string"}},
+        "dsa_questions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["technical_topics", "dsa_questions"]
+}
 
-    final_text = ""
 
-    for line in res.iter_lines():
-        if line:
-            data = json.loads(line.decode("utf-8"))
-            if "response" in data:
-                final_text += data["response"]
+def isValidTopicSet(df) -> bool:
+    """Check the generated JSON against the rules in initializerAgent.txt."""
+    if not isinstance(df, dict) or set(df) != {"technical_topics", "dsa_questions"}:
+        return False
+
+    for key, (low, high) in (("technical_topics", (4, 5)), ("dsa_questions", (2, 3))):
+        topics = df[key]
+        if not isinstance(topics, list) or not low <= len(topics) <= high:
+            return False
+        if not all(isinstance(t, str) and TOPIC_PATTERN.match(t) for t in topics):
+            return False
+
+    return True
+
+
+async def generateTopics():
+    """Generate one topic set with the LLM; None if the output is unusable."""
+    system_prompt, _ = currentPrompt("initializerAgent.txt")
+    try:
+        final_text = await chat("initializerAgent", system_prompt, "Generate the interview topics.", format=TOPICS_SCHEMA)
+    except Exception as e:
+        logger.warning("Topic generation failed: %s", e)
+        return None
 
     try:
         df = json.loads(final_text)
     except Exception as e:
-        print("JSON PARSE FAILED:", e)
-        print("TEXT WAS:", final_text)
-        return{
-            "technical_topics": [
-                "Convolutional Neural Network Architecture - easy",
-                "Redis In-Memory Data Store - medium",
-                "Kubernetes Cluster Management - medium",
-                "Hash Table Collision Resolution - medium",
-                "Graph-Based Recommendation Systems - easy"
-            ],
-            "dsa_questions": [
-                "0/1 Knapsack Problem - medium",
-                "Tower of Hanoi Algorithm - easy",
-                "Minimum Window Substring - medium"
-            ]
-        }
-        # hardcoded fallback in-case llm still return other than json format to continue the application
+        logger.warning("Topic output is not JSON (%s): %s", e, final_text)
+        return None
+
+    if not isValidTopicSet(df):
+        logger.warning("Invalid topic set: %s", df)
+        return None
 
-    print("\ndone generating topics\n\n")
     return df
 
 
-# getTopicsForInterview()
\ No newline at end of file
+async def getTopicsForInterview():
+    df = await generateTopics()
+
+    if df is None:
+        # hardcoded fallback in-case llm still return other than json format to continue the application
+        return FALLBACK_TOPICS
+
+    logger.debug("Generated topics: %s", df)
+    return df
@@ -1,70 +1,57 @@
 from ai.agents.starterAgent import invokeStarterAgent
 from ai.agents.technicalAgent import invokeTechnicalAgent
 
-from back.db.allMeetFunctions import (
-    getMeet,
-    getQuestionAsked,
-    getTopics,
-    removeTopic,
-    incrementAskedQs
-)
+from back.db.allMeetFunctions import getQuestionAsked, getTopics
+from back.db.meetState import MeetState
+from back.db.utils.messages import putMessage
 
-async def startAgent(meetID: str):
-    meet = getMeet(meetID)  # ✅ SINGLE DB HIT
+async def startAgent(state: MeetState):
+    """Generate the next question for the meet.
+
+    Yields `{"type": "chunk", "data": ...}` while streaming and a final
+    `{"type": "final", "question", "topic_name", "topic_category"}` when the
+    LLM output parsed. Nothing is written here; the caller decides whether
+    to keep the question and then calls `commitQuestion`.
+    """
+    meet = state.meet  # ✅ NO DB HIT, session cache
 
     question_asked = getQuestionAsked(meet)
 
     if question_asked < 2:
-        meet = getMeet(meetID)
-        topics = getTopics(meet, "candidate_questions")
+        topic_category = "candidate_questions"
+        agent = invokeStarterAgent
+
+    elif question_asked <= len(getTopics(meet, "technical_questions")):
+        topic_category = "technical_questions"
+        agent = invokeTechnicalAgent
 
-        selected_topic = None
+    else:
+        return
 
-        async for msg in invokeStarterAgent(meetID, topics):
+    topics = getTopics(meet, topic_category)
 
-            # Streaming token
-            if msg["type"] == "chunk":
-                yield msg["data"]
+    # Opening questions rendered by the question pool are served without a model call
+    prepared = meet.get("prepared_questions", {}).get(topic_category)
+    if prepared and prepared["topic_name"] in topics:
+        yield {"type": "chunk", "data": prepared["question"]}
+        yield {"type": "final", **prepared, "topic_category": topic_category}
+        return
 
-            # Final structured result
-            elif msg["type"] == "final":
-                question_text = msg["question"]
-                selected_topic = msg["topic_name"]
+    async for msg in agent(topics):
 
-        if selected_topic:
-            removeTopic(meetID, "candidate_questions", selected_topic)
-            incrementAskedQs(meetID)
+        # Streaming token
+        if msg["type"] == "chunk":
+            yield msg
+
+        # Final structured result
+        elif msg["type"] == "final":
+            yield {**msg, "topic_category": topic_category}
+
+
+async def commitQuestion(state: MeetState, final: dict):
+    # Save only the question to DB and mark its topic as asked
+    putMessage(state.meetID, final["question"], "Jarvis")
+
+    if final["topic_name"]:
+        await state.consumeTopic(final["topic_category"], final["topic_name"])
 
-    
-    elif question_asked <= len(getTopics(meet, "technical_questions")):
-        topics = getTopics(meet, "technical_questions")
-
-        selected_topic = None
-
-        async for msg in invokeTechnicalAgent(meetID, topics):
-
-            # Streaming token
-            if msg["type"] == "chunk":
-                yield msg["data"]
-
-            # Final structured result
-            elif msg["type"] == "final":
-                question_text = msg["question"]
-                selected_topic = msg["topic_name"]
-
-        if selected_topic:
-            removeTopic(meetID, "technical_questions", selected_topic)
-            incrementAskedQs(meetID)
-
-    
-    # elif question_asked["question_asked"] == question_asked["firstHalfQ"]:
-    #     incrementAskedQs(meetID)
-    #     async for chunk in invokeStarterAgent(meetID):
-    #         yield chunk
-    #     return
-    
-    # elif question_asked["question_asked"] < question_asked["questions"]:
-    #     incrementAskedQs(meetID)
-    #     async for chunk in invokeStarterAgent(meetID):
-    #         yield chunk
-    #     return
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import difflib
+import logging
+
+from ai.llmClient import streamChat
+from ai.jsonStream import JsonObjectStreamer
+
+logger = logging.getLogger(__name__)
+
+# Attempts per question; a retry only happens if nothing reached the client yet
+MAX_QUESTION_ATTEMPTS = int(os.getenv("MAX_QUESTION_ATTEMPTS", "2"))
+
+
+def questionSchema(topics: list) -> dict:
+    # Ollama constrains decoding to this schema; the enum keeps topic_name inside the list
+    return {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "topic_name": {"type": "string", "enum": list(topics)}
+        },
+        "required": ["question", "topic_name"]
+    }
+
+
+def matchTopic(topic_name: str | None, topics: list):
+    if topic_name in topics:
+        return topic_name
+    if topic_name:
+        close = difflib.get_close_matches(topic_name, topics, n=1, cutoff=0.6)
+        if close:
+            return close[0]
+    return None
+
+
+async def streamQuestion(agent: str, system_prompt: str, topics: list):
+    """Stream only the `question` field's text, then a final message.
+
+    Yields `{"type": "chunk", "data": ...}` for question characters as they
+    are decoded and `{"type": "final", "question", "topic_name"}` once both
+    fields are known. Yields no final if every attempt was malformed.
+    """
+    topics_str = ", ".join(topics)
+    user_message = f"Topics: {topics_str}"
+
+    for attempt in range(1, MAX_QUESTION_ATTEMPTS + 1):
+        parser = JsonObjectStreamer()
+        streamed = False
+
+        async for chunk in streamChat(agent, system_prompt, user_message, format=questionSchema(topics)):
+            for event, key, text in parser.feed(chunk):
+                if event == "delta" and key == "question":
+                    streamed = True
+                    # Stream to frontend
+                    yield {
+                        "type": "chunk",
+                        "data": text
+                    }
+
+        question = (parser.values.get("question") or "").strip()
+        topic_name = matchTopic(parser.values.get("topic_name"), topics)
+
+        if question and topic_name:
+            # Final signal to caller
+            yield {
+                "type": "final",
+                "question": question,
+                "topic_name": topic_name
+            }
+            return
+
+        logger.warning("%s: malformed question output (attempt %s): %s", agent, attempt, parser.values)
+        if streamed:
+            # Part of the question already reached the client; a retry would garble it
+            return
@@ -0,0 +1,58 @@
+import json
+import logging
+
+from ai.llmClient import chat
+from ai.scheduler import BACKGROUND
+from ai.prompts import currentPrompt
+
+logger = logging.getLogger(__name__)
+
+SCORES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scores": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "score": {"type": "integer", "minimum": 1, "maximum": 10},
+                    "feedback": {"type": "string"}
+                },
+                "required": ["index", "score", "feedback"]
+            }
+        }
+    },
+    "required": ["scores"]
+}
+
+
+async def scoreAnswers(pairs: list, timeout: float = 120.0):
+    """Score (question, answer) pairs in one call.
+
+    Returns one `{"score", "feedback"}` per pair, or None where the model
+    gave nothing usable for it. Raises if the call itself fails.
+    """
+    user_message = "\n".join(
+        f"{i}. Question: {question}\n   Answer: {answer}"
+        for i, (question, answer) in enumerate(pairs, start=1)
+    )
+
+    system_prompt, _ = currentPrompt("scoringAgent.txt")
+    raw_text = await chat("scoringAgent", system_prompt, user_message, timeout=timeout, format=SCORES_SCHEMA, priority=BACKGROUND)
+
+    try:
+        parsed = json.loads(raw_text)
+    except Exception as e:
+        logger.warning("Scoring output is not JSON (%s): %s", e, raw_text[:200])
+        return [None] * len(pairs)
+
+    results = [None] * len(pairs)
+    for entry in parsed.get("scores") or []:
+        try:
+            index, score = int(entry["index"]) - 1, int(entry["score"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(pairs) and 1 <= score <= 10:
+            results[index] = {"score": score, "feedback": str(entry.get("feedback", "")).strip()}
+    return results
@@ -1,34 +1,21 @@
 import os
-import json
-import requests
+import logging
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROMPT_PATH = os.path.join(BASE_DIR, "..", "prompts", "sentenceEnhancer.txt")
+from ai.llmClient import chat
+from ai.scheduler import BACKGROUND
+from ai.prompts import currentPrompt
 
-with open(PROMPT_PATH, "r", encoding="utf-8") as f:
-    PROMPT_TEMPLATE = f.read()
+logger = logging.getLogger(__name__)
 
-def enhance_sentence(sentence: str):
-    prompt = PROMPT_TEMPLATE.format(sentence=sentence)
+# Cleanup is optional, so it never waits long for the model
+ENHANCE_TIMEOUT = float(os.getenv("ENHANCE_TIMEOUT", "5"))
 
-    res = requests.post(
-        "http://localhost:11434/api/generate",
-        json={
-            "model": "llama3.1:8b",
-            "prompt": prompt,
-            "stream": True
-        },
-        stream=True,
-        timeout=120
-    )
+async def enhance_sentence(sentence: str, priority: int = BACKGROUND):
+    system_prompt, _ = currentPrompt("sentenceEnhancer.txt")
+    final_text = (await chat("sentenceEnhancer", system_prompt, sentence, timeout=ENHANCE_TIMEOUT, priority=priority)).strip().strip('"')
 
-    final_text = ""
-
-    for line in res.iter_lines():
-        if line:
-            data = json.loads(line.decode("utf-8"))
-            if "response" in data:
-                final_text += data["response"]
-
-    # print(final_text)
-    return final_text
\ No newline at end of file
+    # A rewrite, an explanation or an empty reply is worse than the raw transcript
+    if not final_text or "\n" in final_text or not 0.6 <= len(final_text) / max(len(sentence), 1) <= 1.6:
+        logger.debug("Discarding enhancer output: %r", final_text)
+        return sentence
+    return final_text
@@ -1,45 +1,67 @@
-import os
 import json
-import httpx
+import time
+import logging
 
+from ai.llmClient import chat, LLM_MODEL
+from ai.scheduler import LLMBusyError, INTERACTIVE
+from ai.prompts import currentPrompt
+from ai.verdictCache import verdictCache, VERDICT_CACHE_ENABLED
+from ai.prefilter import prefilter, recordDecision, ACCEPT, REJECT
 from back.db.utils.messages import putMessage
-from back.db.allMeetFunctions import getMeet, getQuestionAsked
+from back.db.allMeetFunctions import getQuestionAsked
+from back.db.meetState import MeetState
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROMPT_PATH = os.path.join(BASE_DIR, "..", "prompts", "validationAgent.txt")
+logger = logging.getLogger(__name__)
 
-with open(PROMPT_PATH, "r", encoding="utf-8") as f:
-    PROMPT_TEMPLATE = f.read()
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {"type": "string", "enum": ["success", "failed"]},
+        "message": {"type": "string"}
+    },
+    "required": ["status", "message"]
+}
 
-async def validate(meetID, llm_response, userMessage):
-    print(f"[FOLLOWUP] Function called", flush=True)
-    meet = getMeet(meetID)
-    question_number = getQuestionAsked(meet)
+async def validate(state: MeetState, llm_response, userMessage):
+    question_number = getQuestionAsked(state.meet)
     
     if question_number < 2:
-        print("\nValidating\n")
-        print(llm_response)
+        logger.debug("Validating answer to: %s", llm_response)
+
+        # Clear-cut answers are decided locally; only ambiguous ones reach the LLM
+        decision, reason = prefilter("validation", userMessage, lenient=True)
+        if decision == REJECT:
+            logger.debug("Prefilter rejected answer (%s)", reason)
+            return {
+                "status": "failed",
+                "message": "Invalid or meaningless response."
+            }
+        if decision == ACCEPT:
+            logger.debug("Prefilter accepted answer (%s)", reason)
+            return {
+                "status": "success",
+                "message": "Valid response."
+            }
         
-        prompt = (
-            PROMPT_TEMPLATE
-            .replace("<question>", llm_response)
-            .replace("<answer>", userMessage)
-        )
+        user_message = f"Question: {llm_response}\nAnswer: {userMessage}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            res = await client.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "llama3.1:8b",
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
+        start = time.perf_counter()
+        system_prompt, prompt_version = currentPrompt("validationAgent.txt")
+        cache_key = verdictCache.key("validation", LLM_MODEL, prompt_version, llm_response or "", userMessage)
+        if VERDICT_CACHE_ENABLED:
+            cached = await verdictCache.get("validation", cache_key)
+            if cached:
+                recordDecision("validation", "cache", cached["status"], time.perf_counter() - start)
+                return cached
 
         try:
-            data = res.json()
-            raw_text = data.get("response", "")
-        except Exception:
+            raw_text = await chat("validationAgent", system_prompt, user_message, timeout=60.0, format=VERDICT_SCHEMA, priority=INTERACTIVE)
+        except LLMBusyError:
+            # Overload is reported to the candidate by the turn, not as a bad answer
+            raise
+        except Exception as e:
+            logger.warning("Validation call failed: %s", e)
+            recordDecision("validation", "llm", "error", time.perf_counter() - start)
             return {
                 "status": "failed",
                 "message": "Internal validation error. Please answer again."
@@ -53,6 +75,7 @@ async def validate(meetID, llm_response, userMessage):
         try:
             parsed = json.loads(raw_text)
         except Exception:
+            recordDecision("validation", "llm", "error", time.perf_counter() - start)
             return {
                 "status": "failed",
                 "message": "Internal validation error. Please answer again."
@@ -60,6 +83,7 @@ async def validate(meetID, llm_response, userMessage):
 
         status = parsed.get("status")
         message = parsed.get("message")
+        recordDecision("validation", "llm", str(status), time.perf_counter() - start)
 
         # if status not in ("success", "failed") or not isinstance(message, str):
         #     return {
@@ -67,9 +91,10 @@ async def validate(meetID, llm_response, userMessage):
         #         "message": "Internal validation error. Please answer again."
         #     }
 
-        print("\nValidation Done\n")
-        print("Status:", status)
-        print("Message:", message)
+        logger.debug("Validation done: %s (%s)", status, message)
+
+        if VERDICT_CACHE_ENABLED and status in ("success", "failed") and isinstance(message, str):
+            await verdictCache.put(cache_key, {"status": status, "message": message})
         
         return {
             "status": status,
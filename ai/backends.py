@@ -0,0 +1,184 @@
+import json
+import httpx
+
+
+class LLMBackend:
+    """Adapter for one kind of model server.
+
+    Subclasses translate a (system, user, format) chat call into the
+    server's wire format and back. Both methods report usage in Ollama's
+    field names (`prompt_eval_count`, `prompt_eval_duration`, `eval_count`,
+    `eval_duration`, durations in ns) so stats stay comparable across servers.
+    """
+
+    name = "base"
+
+    def __init__(self, base_url: str, model: str, timeout: httpx.Timeout, limits: httpx.Limits, api_key: str | None = None):
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.limits = limits
+        self.api_key = api_key
+        # One pooled client per backend, created lazily inside the running event loop
+        self._client: httpx.AsyncClient | None = None
+
+    def getClient(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers=headers
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def chat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        """Return (text, usage)."""
+        raise NotImplementedError
+
+    async def streamChat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        """Yield (chunk, usage); usage is None until the final item."""
+        raise NotImplementedError
+        yield
+
+
+class OllamaBackend(LLMBackend):
+    name = "ollama"
+
+    def __init__(self, *args, keep_alive: str = "30m", **kwargs):
+        super().__init__(*args, **kwargs)
+        # How long Ollama keeps the model (and its prompt cache) loaded between calls
+        self.keep_alive = keep_alive
+
+    def buildRequest(self, system: str, user: str, stream: bool, format=None) -> dict:
+        # System message first and byte-identical across calls: that is the cached prefix
+        body = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            "stream": stream,
+            "keep_alive": self.keep_alive
+        }
+        if format is not None:
+            body["format"] = format
+        return body
+
+    async def chat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        res = await self.getClient().post(
+            "/api/chat",
+            json=self.buildRequest(system, user, False, format),
+            timeout=timeout
+        )
+        res.raise_for_status()
+        data = res.json()
+        return (data.get("message") or {}).get("content") or "", data
+
+    async def streamChat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        async with self.getClient().stream(
+            "POST",
+            "/api/chat",
+            json=self.buildRequest(system, user, True, format),
+            timeout=timeout
+        ) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                chunk = (data.get("message") or {}).get("content")
+                if chunk:
+                    yield chunk, None
+                if data.get("done", False):
+                    yield "", data
+                    break
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """OpenAI-style /v1/chat/completions, as served by llama.cpp, vLLM and others."""
+
+    name = "openai"
+
+    def buildRequest(self, system: str, user: str, stream: bool, format=None) -> dict:
+        body = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            "stream": stream
+        }
+        if stream:
+            body["stream_options"] = {"include_usage": True}
+        if isinstance(format, dict):
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": format}
+            }
+        elif format == "json":
+            body["response_format"] = {"type": "json_object"}
+        return body
+
+    @staticmethod
+    def usage(data: dict) -> dict:
+        usage = data.get("usage") or {}
+        # llama.cpp adds per-request timings; plain OpenAI servers only count tokens
+        timings = data.get("timings") or {}
+        return {
+            "prompt_eval_count": usage.get("prompt_tokens", timings.get("prompt_n", 0)),
+            "prompt_eval_duration": int(timings.get("prompt_ms", 0) * 1e6),
+            "eval_count": usage.get("completion_tokens", timings.get("predicted_n", 0)),
+            "eval_duration": int(timings.get("predicted_ms", 0) * 1e6)
+        }
+
+    async def chat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        res = await self.getClient().post(
+            "/v1/chat/completions",
+            json=self.buildRequest(system, user, False, format),
+            timeout=timeout
+        )
+        res.raise_for_status()
+        data = res.json()
+        choices = data.get("choices") or [{}]
+        return (choices[0].get("message") or {}).get("content") or "", self.usage(data)
+
+    async def streamChat(self, system: str, user: str, format=None, timeout=httpx.USE_CLIENT_DEFAULT):
+        usage = {}
+        async with self.getClient().stream(
+            "POST",
+            "/v1/chat/completions",
+            json=self.buildRequest(system, user, True, format),
+            timeout=timeout
+        ) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    data = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                if data.get("usage") or data.get("timings"):
+                    usage = self.usage(data)
+                for choice in data.get("choices") or []:
+                    chunk = (choice.get("delta") or {}).get("content")
+                    if chunk:
+                        yield chunk, None
+        yield "", usage
+
+
+BACKENDS = {
+    OllamaBackend.name: OllamaBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend
+}
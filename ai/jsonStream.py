@@ -0,0 +1,127 @@
+ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonObjectStreamer:
+    """Incremental parser for a flat JSON object of string values.
+
+    Feed it raw model output as it streams; `feed` returns events as soon as
+    they can be known:
+
+    - `("delta", key, text)` for each decoded piece of a string value
+    - `("value", key, value)` when a string value is complete
+
+    Non-string values are skipped. Anything outside the top-level object
+    (leading prose, trailing text) is ignored.
+    """
+
+    def __init__(self):
+        self.state = "start"
+        self.key = ""
+        self.value = ""
+        self.escape = ""
+        self.reading_key = False
+        self.depth = 0
+        self.skip_string = False
+        self.skip_escape = False
+        self.closed = False
+        self.values = {}
+
+    def feed(self, text: str):
+        events = []
+        delta = ""
+
+        for ch in text:
+            if self.closed:
+                break
+
+            if self.state == "string":
+                if self.escape:
+                    self.escape += ch
+                    if self.escape.startswith("\\u"):
+                        if len(self.escape) < 6:
+                            continue
+                        try:
+                            decoded = chr(int(self.escape[2:], 16))
+                        except ValueError:
+                            decoded = ""
+                    else:
+                        decoded = ESCAPES.get(ch, ch)
+                    self.escape = ""
+                    if self.reading_key:
+                        self.key += decoded
+                    else:
+                        self.value += decoded
+                        delta += decoded
+                elif ch == "\\":
+                    self.escape = "\\"
+                elif ch == '"':
+                    if self.reading_key:
+                        self.state = "colon"
+                    else:
+                        if delta:
+                            events.append(("delta", self.key, delta))
+                            delta = ""
+                        self.values[self.key] = self.value
+                        events.append(("value", self.key, self.value))
+                        self.state = "comma"
+                elif self.reading_key:
+                    self.key += ch
+                else:
+                    self.value += ch
+                    delta += ch
+
+            elif self.state == "start":
+                if ch == "{":
+                    self.state = "key"
+
+            elif self.state == "key":
+                if ch == '"':
+                    self.key = ""
+                    self.reading_key = True
+                    self.state = "string"
+                elif ch == "}":
+                    self.closed = True
+
+            elif self.state == "colon":
+                if ch == ":":
+                    self.state = "value"
+
+            elif self.state == "value":
+                if ch == '"':
+                    self.value = ""
+                    self.reading_key = False
+                    self.state = "string"
+                elif not ch.isspace():
+                    # Number, bool, null, array or object: skip to the next key
+                    self.depth = 1 if ch in "[{" else 0
+                    self.state = "skip"
+
+            elif self.state == "skip":
+                if self.skip_string:
+                    if self.skip_escape:
+                        self.skip_escape = False
+                    elif ch == "\\":
+                        self.skip_escape = True
+                    elif ch == '"':
+                        self.skip_string = False
+                elif ch == '"':
+                    self.skip_string = True
+                elif ch in "[{":
+                    self.depth += 1
+                elif ch in "]}" and self.depth:
+                    self.depth -= 1
+                elif ch == "," and not self.depth:
+                    self.state = "key"
+                elif ch == "}" and not self.depth:
+                    self.closed = True
+
+            elif self.state == "comma":
+                if ch == ",":
+                    self.state = "key"
+                elif ch == "}":
+                    self.closed = True
+
+        if delta:
+            events.append(("delta", self.key, delta))
+
+        return events
@@ -0,0 +1,132 @@
+import os
+import time
+import httpx
+from dotenv import load_dotenv
+
+from ai.backends import BACKENDS, OllamaBackend
+from ai.scheduler import scheduler
+from back.metrics import recordLLMPhase, recordLLMUsage
+
+load_dotenv()
+
+# Which model server to talk to: "ollama" or "openai" (any OpenAI-compatible
+# server such as llama.cpp). Point LLM_BASE_URL at ai/stubServer.py to run
+# without a model.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "ollama")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3.1:8b")
+LLM_API_KEY = os.getenv("LLM_API_KEY")
+# How long Ollama keeps the model (and its prompt cache) loaded between calls
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "16"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+_backend = None
+
+# Per-agent totals of the server's timing fields, to show prompt-cache effectiveness
+PROMPT_EVAL_STATS = {}
+
+
+def getBackend():
+    global _backend
+    if _backend is None:
+        if LLM_BACKEND not in BACKENDS:
+            raise Exception(f"❌ Unknown LLM_BACKEND: {LLM_BACKEND}")
+
+        kwargs = {"keep_alive": LLM_KEEP_ALIVE} if BACKENDS[LLM_BACKEND] is OllamaBackend else {}
+        _backend = BACKENDS[LLM_BACKEND](
+            LLM_BASE_URL,
+            LLM_MODEL,
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+            ),
+            api_key=LLM_API_KEY,
+            **kwargs
+        )
+    return _backend
+
+
+async def closeClient():
+    if _backend is not None:
+        await _backend.close()
+
+
+def recordPromptEval(agent: str, data: dict):
+    stats = PROMPT_EVAL_STATS.setdefault(agent, {
+        "calls": 0,
+        "prompt_eval_count": 0,
+        "prompt_eval_ms": 0.0,
+        "eval_count": 0,
+        "eval_ms": 0.0
+    })
+    stats["calls"] += 1
+    stats["prompt_eval_count"] += data.get("prompt_eval_count", 0)
+    stats["prompt_eval_ms"] += data.get("prompt_eval_duration", 0) / 1e6
+    stats["eval_count"] += data.get("eval_count", 0)
+    stats["eval_ms"] += data.get("eval_duration", 0) / 1e6
+    recordLLMUsage(agent, data)
+
+
+def getPromptEvalStats():
+    """Mean prompt-eval tokens/time per agent; cache hits show as few evaluated tokens."""
+    report = {}
+    for agent, s in PROMPT_EVAL_STATS.items():
+        calls = s["calls"] or 1
+        report[agent] = {
+            "calls": s["calls"],
+            "mean_prompt_eval_tokens": round(s["prompt_eval_count"] / calls, 1),
+            "mean_prompt_eval_ms": round(s["prompt_eval_ms"] / calls, 1),
+            "mean_eval_tokens": round(s["eval_count"] / calls, 1),
+            "mean_eval_ms": round(s["eval_ms"] / calls, 1)
+        }
+    return report
+
+
+async def chat(agent: str, system: str, user: str, timeout: float | None = None, format=None, priority: int | None = None) -> str:
+    """Run a non-streaming chat call and return the assistant's text.
+
+    Waits for a scheduler slot first; raises `LLMBusyError` if none frees up in time.
+    """
+    queued = time.perf_counter()
+    async with scheduler.slot(priority):
+        started = time.perf_counter()
+        recordLLMPhase(agent, "queue", started - queued)
+        text, usage = await getBackend().chat(
+            system,
+            user,
+            format=format,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+        recordLLMPhase(agent, "total", time.perf_counter() - started)
+    recordPromptEval(agent, usage)
+    return text
+
+
+async def streamChat(agent: str, system: str, user: str, timeout: float | None = None, format=None, priority: int | None = None):
+    """Yield assistant text chunks as they stream, holding one scheduler slot throughout."""
+    queued = time.perf_counter()
+    async with scheduler.slot(priority):
+        started = time.perf_counter()
+        recordLLMPhase(agent, "queue", started - queued)
+        first_token = False
+        async for chunk, usage in getBackend().streamChat(
+            system,
+            user,
+            format=format,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        ):
+            if chunk:
+                if not first_token:
+                    first_token = True
+                    recordLLMPhase(agent, "ttft", time.perf_counter() - started)
+                yield chunk
+            if usage is not None:
+                recordLLMPhase(agent, "total", time.perf_counter() - started)
+                recordPromptEval(agent, usage)
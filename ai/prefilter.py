@@ -0,0 +1,197 @@
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Decisions of the local classifier; only UNSURE answers go to the LLM
+ACCEPT = "accept"
+REJECT = "reject"
+UNSURE = "unsure"
+
+# Whole answers that carry no content
+FILLER_ANSWERS = {
+    "um", "uh", "umm", "uhh", "hmm", "hm", "ah", "er", "erm", "test", "testing",
+    "can you hear me", "am i audible", "one two three", "what", "pardon", "repeat",
+    "again", "nothing", "none",
+}
+
+# Short acknowledgements; fine as a reply to small talk, never an answer to a question
+ACK_ANSWERS = {
+    "ok", "okay", "k", "yes", "yeah", "yep", "no", "nope", "nah", "sure", "right",
+    "cool", "fine", "thanks", "thank you", "sorry", "next", "skip", "pass",
+    "ok let's start", "okay let's start", "let's start", "let's begin", "yes let's start",
+}
+
+# Greetings are a valid reply to the welcome message but never answer a question
+GREETING_ANSWERS = {
+    "hi", "hello", "hey", "hello there", "hi there", "hey there", "good morning",
+    "good afternoon", "good evening", "hello jarvis", "hi jarvis", "hey jarvis",
+}
+
+REFUSAL_PHRASES = (
+    "i don't know", "i dont know", "i do not know", "don't know", "dont know",
+    "no idea", "not sure", "idk", "i can't answer", "i cannot answer",
+    "i can't say", "no clue", "i have no idea", "skip this", "next question",
+    "i'd rather not", "i would rather not", "i forgot", "i don't remember",
+    "i dont remember", "i don't understand", "i dont understand",
+)
+
+COMMON_WORDS = set("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing done down during
+each few for from further get got had has have having he her here hers him his how i
+if in into is it its itself just like me more most my myself no nor not now of off on
+once only or other our ours out over own same she should so some such than that the
+their them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours yourself
+actually already always basically because better big bit called certain different
+example first good great important kind know learn learned learning lot make many
+mean means mostly much need new next often okay one part people pretty probably
+quite really right say see something sometimes start started still take thing things
+think time try two use used uses using usually want way well work worked working
+year years able across almost another around back best case cause change come comes
+data each either else enough even ever every fast find free give given going hard
+help high however keep large last least less level long low main may might most
+move must never number old open order place point problem problems project projects
+put rather real reason same second set show side simple since small space state
+step system take tell three together top turn type understand value via whole within
+without world yes also name hi hello thanks
+im i'm i've ive i'd id i'll ill it's its don't dont doesn't doesnt didn't didnt
+can't cant won't wont that's thats there's theres we're were they're theyre you're
+database databases query queries index indexes indexing table tables key keys
+cache caching memory storage server servers client clients request requests api
+network networks protocol http tcp ip latency throughput thread threads process
+processes lock locks concurrency parallel async function functions class classes
+object objects method methods variable variables array arrays list lists tree trees
+graph graphs node nodes edge edges hash map maps stack queue heap sort sorting search
+searching algorithm algorithms complexity time linear binary recursion recursive
+dynamic programming loop loops pointer pointers model models training trained
+neural network layer layers learning machine deep feature features dataset
+python java javascript react node sql nosql mongo redis docker kubernetes cloud aws
+linux operating kernel file files code coding software developer development engineer
+engineering backend frontend design pattern patterns service services distributed
+scalable scale scaling performance optimize optimization test testing bug bugs
+""".split())
+
+# Words that carry no answer content; a refusal padded only with these is still a refusal
+STOPWORDS = set("""
+a an the i i'm im me my we it it's its is am are was be been to of in on at for and or but so
+just really honestly actually maybe perhaps probably sorry well um uh hmm like you know think
+that this about what how sir ma'am please can could would will right now yet any anything
+have has had do does did no not one question
+""".split())
+
+VOWELS = set("aeiouy")
+
+FOLLOWUP_PROMPT = "No worries, take your time. Could you share whatever you know about it, even a partial answer?"
+
+# Per-agent decision counts and time spent, for the prefilter and the LLM stage
+STATS = {}
+
+REPORT_EVERY = 50
+
+
+def tokenize(text: str):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def isWordLike(token: str) -> bool:
+    if token in COMMON_WORDS or token.isdigit():
+        return True
+    if len(token) > 20 or not VOWELS & set(token):
+        return False
+    # Keyboard mash tends to have long consonant runs ("asdfgh", "qwrtpl")
+    return re.search(r"[^aeiouy']{5,}", token) is None
+
+
+def sharesTerms(question: str, tokens: list) -> bool:
+    """True if the answer reuses a content word of the question (compared on a 5-letter stem)."""
+    stems = {t[:5] for t in tokenize(question) if t not in STOPWORDS and len(t) > 2}
+    return any(t[:5] in stems for t in tokens if t not in STOPWORDS and len(t) > 2)
+
+
+def classifyAnswer(answer: str, lenient: bool = False, question: str | None = None):
+    """Return (decision, reason) for an answer without calling the LLM.
+
+    `lenient` is for the warm-up validation: greetings are accepted and bare
+    acknowledgements are left to the LLM instead of being rejected. With a
+    `question`, fluent answers are only accepted if they share a term with
+    it, so off-topic answers still reach the LLM's relevance check.
+    """
+    text = (answer or "").strip().lower()
+    tokens = tokenize(text)
+
+    if not tokens:
+        return REJECT, "empty"
+
+    joined = " ".join(tokens)
+    if joined in GREETING_ANSWERS:
+        return (ACCEPT if lenient else REJECT), "greeting"
+
+    if joined in ACK_ANSWERS:
+        return (UNSURE if lenient else REJECT), "acknowledgement"
+
+    if joined in FILLER_ANSWERS:
+        return REJECT, "filler"
+
+    if len(tokens) <= 8 and any(p in text for p in REFUSAL_PHRASES):
+        # "I'm not sure, maybe hashing?" is still an attempt; only bare refusals are rejected
+        remainder = text
+        for phrase in REFUSAL_PHRASES:
+            remainder = remainder.replace(phrase, " ")
+        content = [t for t in tokenize(remainder)
+                   if t not in STOPWORDS and t not in FILLER_ANSWERS and t not in ACK_ANSWERS]
+        if not content:
+            return REJECT, "refusal"
+        return UNSURE, "hedged attempt"
+
+    unique_ratio = len(set(tokens)) / len(tokens)
+    if len(tokens) >= 4 and unique_ratio < 0.3:
+        return REJECT, "repetition"
+
+    word_like_ratio = sum(isWordLike(t) for t in tokens) / len(tokens)
+    if word_like_ratio < 0.5:
+        return REJECT, "gibberish"
+
+    dictionary_ratio = sum(t in COMMON_WORDS for t in tokens) / len(tokens)
+    if len(tokens) >= 8 and dictionary_ratio >= 0.4 and unique_ratio >= 0.5 and word_like_ratio >= 0.8:
+        if question is not None and not sharesTerms(question, tokens):
+            return UNSURE, "possibly off-topic"
+        return ACCEPT, "content"
+
+    return UNSURE, "ambiguous"
+
+
+def recordDecision(agent: str, stage: str, decision: str, seconds: float):
+    agent_stats = STATS.setdefault(agent, {})
+    stage_stats = agent_stats.setdefault(stage, {"count": 0, "seconds": 0.0, "decisions": {}})
+    stage_stats["count"] += 1
+    stage_stats["seconds"] += seconds
+    stage_stats["decisions"][decision] = stage_stats["decisions"].get(decision, 0) + 1
+
+    total = agent_stats["prefilter"]["count"] if "prefilter" in agent_stats else 0
+    if stage == "prefilter" and total % REPORT_EVERY == 0:
+        logger.info("Prefilter %s: %s", agent, getStats()[agent])
+
+
+def getStats():
+    """Decision rates and mean latency per agent and stage."""
+    report = {}
+    for agent, stages in STATS.items():
+        report[agent] = {}
+        for stage, s in stages.items():
+            report[agent][stage] = {
+                "count": s["count"],
+                "mean_ms": round(s["seconds"] / s["count"] * 1000, 3) if s["count"] else 0.0,
+                "rates": {d: round(n / s["count"], 3) for d, n in s["decisions"].items()}
+            }
+    return report
+
+
+def prefilter(agent: str, answer: str, lenient: bool = False, question: str | None = None):
+    """Classify an answer and record the decision under the given agent name."""
+    start = time.perf_counter()
+    decision, reason = classifyAnswer(answer, lenient, question)
+    recordDecision(agent, "prefilter", decision, time.perf_counter() - start)
+    return decision, reason
@@ -0,0 +1,44 @@
+import os
+import time
+import hashlib
+
+PROMPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Templates read through currentPrompt are re-checked for edits at most this often
+PROMPT_CHECK_INTERVAL = float(os.getenv("PROMPT_CHECK_INTERVAL", "2"))
+
+# name -> [checked_at, mtime, text, version]
+_current = {}
+
+
+def loadPrompt(name: str) -> str:
+    """Read a prompt template from this directory.
+
+    Templates hold only static instructions and are sent as the system
+    message; per-call values go in the user message so the prefix stays
+    identical between calls and Ollama can reuse its evaluated KV cache.
+    """
+    with open(os.path.join(PROMPTS_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def currentPrompt(name: str):
+    """(text, version) of a template, re-read when its file changes.
+
+    Every agent reads its template through this at call time, so an edited
+    prompt takes effect without a restart. The version is a short hash of
+    the text; results derived from a prompt (e.g. cached verdicts) are
+    keyed on it so an edit invalidates them.
+    """
+    entry = _current.get(name)
+    now = time.monotonic()
+    if entry and now - entry[0] < PROMPT_CHECK_INTERVAL:
+        return entry[2], entry[3]
+
+    mtime = os.path.getmtime(os.path.join(PROMPTS_DIR, name))
+    if not entry or mtime != entry[1]:
+        text = loadPrompt(name)
+        entry = [now, mtime, text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]]
+        _current[name] = entry
+    entry[0] = now
+    return entry[2], entry[3]
@@ -0,0 +1,179 @@
+import os
+import time
+import asyncio
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+
+# Priority classes, lowest value served first
+INTERACTIVE = 0  # validation / follow-up gates the candidate is waiting on
+STREAMING = 1    # question generation streamed to the candidate
+BACKGROUND = 2   # look-ahead drafts, question pool, enhancement
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", STREAMING: "streaming", BACKGROUND: "background"}
+
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+
+# Longest a request may wait for a slot before it is rejected (None = wait forever)
+DEFAULT_DEADLINES = {
+    INTERACTIVE: float(os.getenv("LLM_DEADLINE_INTERACTIVE", "10")),
+    STREAMING: float(os.getenv("LLM_DEADLINE_STREAMING", "20")),
+    BACKGROUND: None
+}
+
+# Set by callers so nested agent calls inherit who they run for and how urgent they are
+currentSession = contextvars.ContextVar("llm_session", default=None)
+currentPriority = contextvars.ContextVar("llm_priority", default=STREAMING)
+
+BUSY_MESSAGE = "I'm handling a lot of interviews right now. Give me a moment and please answer again."
+
+
+class LLMBusyError(Exception):
+    """Raised when a request cannot get an LLM slot before its deadline."""
+
+
+class LLMScheduler:
+    """Admission control in front of the LLM client.
+
+    At most `max_in_flight` calls run at once. Waiting calls are served by
+    priority class, and round-robin across sessions within a class so one
+    busy interview cannot starve the others. A call whose deadline cannot
+    be met, judging by queue depth and recent slot hold times, is rejected
+    immediately instead of queueing.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        # priority -> session -> FIFO of waiting futures
+        self.waiters = {p: OrderedDict() for p in PRIORITY_NAMES}
+        self.avg_hold = 2.0
+        self.stats = {
+            "admitted": {p: 0 for p in PRIORITY_NAMES},
+            "rejected": {p: 0 for p in PRIORITY_NAMES},
+            "wait_seconds": {p: 0.0 for p in PRIORITY_NAMES}
+        }
+
+    def queueDepth(self, priority: int | None = None) -> int:
+        priorities = PRIORITY_NAMES if priority is None else [priority]
+        # Futures given up on are skipped by release() but may still sit in a queue
+        return sum(1 for p in priorities for q in self.waiters[p].values() for f in q if not f.done())
+
+    def estimatedWait(self, priority: int) -> float:
+        if self.in_flight < self.max_in_flight and not self.queueDepth():
+            return 0.0
+        ahead = sum(self.queueDepth(p) for p in PRIORITY_NAMES if p <= priority)
+        # Slots free up roughly every avg_hold / max_in_flight seconds
+        return (ahead + 1) / self.max_in_flight * self.avg_hold
+
+    async def acquire(self, priority: int, session, deadline: float | None):
+        start = time.monotonic()
+
+        if self.in_flight < self.max_in_flight and not self.queueDepth():
+            self.in_flight += 1
+            self.stats["admitted"][priority] += 1
+            return
+
+        if deadline is not None and self.estimatedWait(priority) > deadline:
+            self.stats["rejected"][priority] += 1
+            raise LLMBusyError(f"estimated wait exceeds {deadline}s")
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[priority].setdefault(session, deque()).append(future)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=deadline)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                future.cancel()
+                self.removeWaiter(session, future)
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["rejected"][priority] += 1
+                raise LLMBusyError(f"no LLM slot within {deadline}s")
+            raise
+
+        self.stats["admitted"][priority] += 1
+        self.stats["wait_seconds"][priority] += time.monotonic() - start
+
+    def removeWaiter(self, session, future):
+        # Searched in every class, since promote() may have moved the future
+        for sessions in self.waiters.values():
+            queue = sessions.get(session)
+            if queue and future in queue:
+                queue.remove(future)
+                if not queue:
+                    del sessions[session]
+                return
+
+    def promote(self, session, from_priority: int, to_priority: int):
+        """Move a session's queued calls to another class, e.g. when a
+        background draft becomes the thing the candidate is waiting for."""
+        queue = self.waiters[from_priority].pop(session, None)
+        live = [f for f in queue or () if not f.done()]
+        if live:
+            self.waiters[to_priority].setdefault(session, deque()).extend(live)
+
+    def release(self):
+        # Hand the slot straight to the next waiter so in_flight never dips
+        for priority in sorted(self.waiters):
+            sessions = self.waiters[priority]
+            while sessions:
+                session, queue = next(iter(sessions.items()))
+                future = queue.popleft()
+                # Round-robin: this session goes to the back of its class
+                del sessions[session]
+                if queue:
+                    sessions[session] = queue
+                if not future.done():
+                    future.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int | None = None, session=None, deadline: float | None = -1):
+        priority = currentPriority.get() if priority is None else priority
+        session = currentSession.get() if session is None else session
+        deadline = DEFAULT_DEADLINES[priority] if deadline == -1 else deadline
+
+        await self.acquire(priority, session, deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.avg_hold = 0.8 * self.avg_hold + 0.2 * (time.monotonic() - start)
+            self.release()
+
+    def getStats(self):
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "avg_hold_seconds": round(self.avg_hold, 3),
+            "queue_depth": {name: self.queueDepth(p) for p, name in PRIORITY_NAMES.items()},
+            "admitted": {PRIORITY_NAMES[p]: n for p, n in self.stats["admitted"].items()},
+            "rejected": {PRIORITY_NAMES[p]: n for p, n in self.stats["rejected"].items()},
+            "mean_wait_ms": {
+                PRIORITY_NAMES[p]: round(self.stats["wait_seconds"][p] / n * 1000, 1) if n else 0.0
+                for p, n in self.stats["admitted"].items()
+            }
+        }
+
+
+scheduler = LLMScheduler(LLM_MAX_IN_FLIGHT)
+
+
+@contextmanager
+def llmContext(session=None, priority: int | None = None):
+    """Tag LLM calls made inside this block (and tasks it creates) with a session and priority."""
+    tokens = []
+    if session is not None:
+        tokens.append((currentSession, currentSession.set(session)))
+    if priority is not None:
+        tokens.append((currentPriority, currentPriority.set(priority)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
@@ -0,0 +1,177 @@
+"""Deterministic stand-in for a model server, for load tests and CI.
+
+Speaks both Ollama's /api/chat and the OpenAI-style /v1/chat/completions,
+so either backend can point at it. Replies are canned JSON shaped by the
+request's schema (or an echo of the user message when no format is given),
+emitted at a configurable token rate after a configurable first-token delay.
+
+    python -m ai.stubServer
+    LLM_BASE_URL=http://localhost:11435 uvicorn back.main:app
+"""
+import os
+import re
+import json
+import time
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_HOST = os.getenv("STUB_HOST", "127.0.0.1")
+STUB_PORT = int(os.getenv("STUB_PORT", "11435"))
+# Delay before the first token, and generation speed after it
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0.2"))
+STUB_TOKEN_RATE = float(os.getenv("STUB_TOKEN_RATE", "50"))
+STUB_TOKEN_CHARS = int(os.getenv("STUB_TOKEN_CHARS", "4"))
+
+CANNED_VALUES = {
+    "question": "Could you walk me through how you would approach {topic}?",
+    "message": "Valid response.",
+    "score": 7,
+    "feedback": "Good start; add a concrete example.",
+    "technical_topics": [
+        "Database Indexing - medium",
+        "Process Scheduling - easy",
+        "TCP Congestion Control - medium",
+        "Gradient Descent - easy",
+        "Consistent Hashing - medium"
+    ],
+    "dsa_questions": [
+        "Sliding Window - medium",
+        "Binary Search - easy",
+        "Topological Sort - medium"
+    ]
+}
+
+# Enum values a well-behaved answer should get, so stub interviews keep moving
+PREFERRED_ENUM_VALUES = ("success", "no_followup_needed")
+
+app = FastAPI(title="CrackEM LLM stub")
+
+
+def cannedReply(format, user: str) -> str:
+    if not isinstance(format, dict):
+        return json.dumps({}) if format == "json" else user
+
+    # Keys in schema order, so the question streams before topic_name like a real model
+    reply = {}
+    properties = format.get("properties", {})
+    topic = None
+    for key, schema in properties.items():
+        if "enum" in schema:
+            preferred = [v for v in schema["enum"] if v in PREFERRED_ENUM_VALUES]
+            reply[key] = (preferred or schema["enum"])[0]
+            topic = reply[key]
+        elif key in CANNED_VALUES:
+            reply[key] = CANNED_VALUES[key]
+        elif schema.get("type") == "array" and schema.get("items", {}).get("type") == "object":
+            # One item per numbered entry in the prompt, as batched calls expect
+            count = max(1, len(re.findall(r"^\d+\. ", user, re.MULTILINE)))
+            item = json.loads(cannedReply(schema["items"], user))
+            reply[key] = [{**item, "index": i} if "index" in item else item for i in range(1, count + 1)]
+        elif schema.get("type") == "array":
+            reply[key] = []
+        elif schema.get("type") in ("number", "integer"):
+            reply[key] = 0
+        elif schema.get("type") == "boolean":
+            reply[key] = True
+        else:
+            reply[key] = "stub"
+
+    if isinstance(reply.get("question"), str):
+        reply["question"] = reply["question"].format(topic=topic or "this topic")
+
+    return json.dumps(reply)
+
+
+def tokens(text: str):
+    return [text[i:i + STUB_TOKEN_CHARS] for i in range(0, len(text), STUB_TOKEN_CHARS)] or [""]
+
+
+def timings(prompt: str, pieces: list, started: float) -> dict:
+    elapsed = time.perf_counter() - started
+    return {
+        "prompt_eval_count": len(prompt) // STUB_TOKEN_CHARS,
+        "prompt_eval_duration": int(STUB_LATENCY * 1e9),
+        "eval_count": len(pieces),
+        "eval_duration": int(max(elapsed - STUB_LATENCY, 0) * 1e9)
+    }
+
+
+async def emit(pieces: list):
+    await asyncio.sleep(STUB_LATENCY)
+    for piece in pieces:
+        yield piece
+        if STUB_TOKEN_RATE > 0:
+            await asyncio.sleep(1 / STUB_TOKEN_RATE)
+
+
+def readMessages(body: dict):
+    messages = body.get("messages") or []
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    return system, user
+
+
+@app.post("/api/chat")
+async def ollamaChat(request: Request):
+    body = await request.json()
+    system, user = readMessages(body)
+    pieces = tokens(cannedReply(body.get("format"), user))
+    started = time.perf_counter()
+
+    if not body.get("stream", True):
+        text = "".join([p async for p in emit(pieces)])
+        return JSONResponse({
+            "model": body.get("model"),
+            "message": {"role": "assistant", "content": text},
+            "done": True,
+            **timings(system + user, pieces, started)
+        })
+
+    async def stream():
+        async for piece in emit(pieces):
+            yield json.dumps({"message": {"role": "assistant", "content": piece}, "done": False}) + "\n"
+        yield json.dumps({
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            **timings(system + user, pieces, started)
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/v1/chat/completions")
+async def openaiChat(request: Request):
+    body = await request.json()
+    system, user = readMessages(body)
+    response_format = body.get("response_format") or {}
+    format = (response_format.get("json_schema") or {}).get("schema") or ("json" if response_format else None)
+    pieces = tokens(cannedReply(format, user))
+    started = time.perf_counter()
+
+    def usage():
+        t = timings(system + user, pieces, started)
+        return {"prompt_tokens": t["prompt_eval_count"], "completion_tokens": t["eval_count"]}
+
+    if not body.get("stream"):
+        text = "".join([p async for p in emit(pieces)])
+        return JSONResponse({
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage()
+        })
+
+    async def stream():
+        async for piece in emit(pieces):
+            yield "data: " + json.dumps({"choices": [{"index": 0, "delta": {"content": piece}}]}) + "\n\n"
+        yield "data: " + json.dumps({"choices": [], "usage": usage()}) + "\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=STUB_HOST, port=STUB_PORT)
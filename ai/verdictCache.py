@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+from collections import OrderedDict
+
+from back.metrics import VERDICT_CACHE
+
+logger = logging.getLogger(__name__)
+
+VERDICT_CACHE_ENABLED = os.getenv("VERDICT_CACHE_ENABLED", "true").lower() == "true"
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "5000"))
+VERDICT_CACHE_TTL = float(os.getenv("VERDICT_CACHE_TTL", str(60 * 60 * 6)))
+# Optional tier shared between workers: a redis:// URL or a SQLite file path
+VERDICT_CACHE_URL = os.getenv("VERDICT_CACHE_URL", "")
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+APOSTROPHES = re.compile(r"['\u2019]")
+
+
+def normalize(text: str) -> str:
+    """Case, punctuation and spacing differences do not change a verdict."""
+    text = APOSTROPHES.sub("", (text or "").lower())
+    return " ".join(NON_WORD.sub(" ", text).split())
+
+
+class SqliteTier:
+    """Shared on-disk tier; SQLite handles locking between processes."""
+
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+        self.lock = asyncio.Lock()
+
+    def _get(self, key: str):
+        row = self.db.execute("SELECT value FROM verdicts WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, key: str, verdict: dict):
+        self.db.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+            (key, json.dumps(verdict), time.time() + self.ttl)
+        )
+
+    async def get(self, key: str):
+        async with self.lock:
+            return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, verdict: dict):
+        async with self.lock:
+            await asyncio.to_thread(self._set, key, verdict)
+
+
+class RedisTier:
+    """Shared tier on Redis. Needs the `redis` package."""
+
+    def __init__(self, url: str, ttl: float):
+        # Optional dependency, only imported when configured
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.ttl = int(ttl)
+
+    async def get(self, key: str):
+        raw = await self.client.get(f"crackem:verdict:{key}")
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, verdict: dict):
+        await self.client.set(f"crackem:verdict:{key}", json.dumps(verdict), ex=self.ttl)
+
+
+def makeSharedTier(url: str, ttl: float):
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTier(url, ttl)
+    return SqliteTier(url, ttl)
+
+
+class VerdictCache:
+    """Verdicts of the validation and follow-up agents, by their inputs.
+
+    Both agents are functions of (prompt template, question, answer), so a
+    repeated "I don't know" to the same warm-up question needs no new LLM
+    call. Keys hash the agent, model, template version and normalized
+    text; editing a prompt changes its version, so old verdicts simply stop
+    matching. An in-process LRU with a TTL sits in front of an optional
+    shared tier. Only well-formed LLM verdicts are stored, never errors.
+    """
+
+    def __init__(self, max_size: int, ttl: float, shared=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        # key -> (expires_at, verdict)
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0, "stored": 0, "shared_errors": 0}
+
+    def key(self, agent: str, model: str, prompt_version: str, question: str, answer: str) -> str:
+        raw = "\x1f".join((agent, model, prompt_version, normalize(question), normalize(answer)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, agent: str, key: str):
+        entry = self.entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            VERDICT_CACHE.labels(agent, "hit").inc()
+            return dict(entry[1])
+
+        if self.shared:
+            try:
+                verdict = await self.shared.get(key)
+            except Exception as e:
+                self.stats["shared_errors"] += 1
+                logger.warning("Shared verdict cache read failed: %s", e)
+                verdict = None
+            if verdict:
+                self.remember(key, verdict)
+                self.stats["shared_hits"] += 1
+                VERDICT_CACHE.labels(agent, "shared_hit").inc()
+                return dict(verdict)
+
+        self.stats["misses"] += 1
+        VERDICT_CACHE.labels(agent, "miss").inc()
+        return None
+
+    async def put(self, key: str, verdict: dict):
+        self.remember(key, verdict)
+        self.stats["stored"] += 1
+        if self.shared:
+            try:
+                await self.shared.set(key, verdict)
+            except Exception as e:
+                self.stats["shared_errors"] += 1
+                logger.warning("Shared verdict cache write failed: %s", e)
+
+    def remember(self, key: str, verdict: dict):
+        self.entries[key] = (time.monotonic() + self.ttl, dict(verdict))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def getStats(self):
+        return {**self.stats, "size": len(self.entries)}
+
+
+verdictCache = VerdictCache(VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL, makeSharedTier(VERDICT_CACHE_URL, VERDICT_CACHE_TTL))
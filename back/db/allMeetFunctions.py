@@ -1,40 +1,32 @@
-import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
-
-load_dotenv()
-
-MONGO_URI = os.getenv("MONGO_URI")
-if not MONGO_URI:
-    raise Exception("❌ MONGO_URI not found in .env")
-
-client = MongoClient(MONGO_URI)
-db = client["CrackEM"]
-meets = db["meets"]
+from back.db.mongo import meets
 
 
 # ---------- Core Fetch ----------
 
-def getMeet(meetID: str):
-    meet = meets.find_one({"meet_id": meetID})
+async def getMeet(meetID: str):
+    meet = await meets.find_one({"meet_id": meetID})
     if not meet:
         raise Exception(f"❌ Meet not found: {meetID}")
     return meet
 
 
+async def userOwnsMeet(meetID: str, user_id) -> bool:
+    return await meets.find_one({"meet_id": meetID, "user_id": user_id}, {"_id": 1}) is not None
+
+async def iterUserMeets(user_id):
+    """A user's meets, newest first, without their topic lists."""
+    cursor = meets.find({"user_id": user_id}, {"meet_id": 1, "createdAt": 1}).sort("createdAt", -1)
+    async for meet in cursor:
+        yield meet
+
+
 # ---------- Read Helpers (NO DB CALLS) ----------
 
 def getQuestionAsked(meet: dict) -> int:
     return meet["question_asked"]
 
-def getTopics(meet: dict | str, topic_category: str):
-    """Return the topics list for the given category.
-    Accepts either a meet dict (as returned by `getMeet`) or a meetID string.
-    """
-    # If caller passed a meetID string, fetch the meet document
-    if isinstance(meet, str):
-        meet = getMeet(meet)
-
+def getTopics(meet: dict, topic_category: str):
+    """Return the topics list for the given category of a meet dict (as returned by `getMeet`)."""
     if topic_category not in meet:
         raise KeyError(f"Topic category not found in meet: {topic_category}")
 
@@ -43,14 +35,15 @@ def getTopics(meet: dict | str, topic_category: str):
 
 # ---------- Write Helpers (DO DB WRITES) ----------
 
-def removeTopic(meetID: str, topic_category: str, topic: str):
-    meets.update_one(
-        {"meet_id": meetID},
-        {"$pull": {topic_category: topic}}
-    )
+async def insertMeet(meet: dict):
+    await meets.insert_one(meet)
 
-def incrementAskedQs(meetID: str):
-    meets.update_one(
+async def consumeTopic(meetID: str, topic_category: str, topic: str):
+    """Remove an asked topic and count the question in one update."""
+    await meets.update_one(
         {"meet_id": meetID},
-        {"$inc": {"question_asked": 1}}
+        {
+            "$pull": {topic_category: topic},
+            "$inc": {"question_asked": 1}
+        }
     )
@@ -0,0 +1,257 @@
+import os
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+
+from bson import ObjectId, json_util
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from back.db.mongo import messages
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "100"))
+# Longest a message waits in memory before a partial batch is written
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("JOURNAL_FLUSH_INTERVAL", "0.05"))
+# Messages kept in memory while Mongo is unreachable; older ones go to the spill file
+JOURNAL_MAX_BUFFER = int(os.getenv("JOURNAL_MAX_BUFFER", "5000"))
+JOURNAL_SPILL_PATH = os.getenv("JOURNAL_SPILL_PATH", "message_journal.spill")
+JOURNAL_SPILL_MAX_BYTES = int(os.getenv("JOURNAL_SPILL_MAX_BYTES", str(20 * 1024 * 1024)))
+JOURNAL_FLUSH_TIMEOUT = float(os.getenv("JOURNAL_FLUSH_TIMEOUT", "5"))
+JOURNAL_MAX_BACKOFF = float(os.getenv("JOURNAL_MAX_BACKOFF", "5"))
+
+DUPLICATE_KEY = 11000
+
+
+class MessageJournal:
+    """Write-behind buffer for interview messages.
+
+    `append` only queues the document; a single flusher task writes queued
+    messages with `insert_many` once JOURNAL_BATCH_SIZE are waiting or the
+    oldest has waited JOURNAL_FLUSH_INTERVAL. Documents get their `_id` up
+    front, so a batch retried after a partial write cannot duplicate rows,
+    and a per-meet `seq` in append order, continuing from what is stored.
+
+    While Mongo is down the flusher backs off and keeps messages in memory;
+    past JOURNAL_MAX_BUFFER the oldest are moved to an append-only spill
+    file (bounded by JOURNAL_SPILL_MAX_BYTES), which is replayed first once
+    writes succeed again so per-meet order holds.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.buffer = deque()
+        self.next_seq = {}
+        self.wakeup = asyncio.Event()
+        self.flushed = asyncio.Event()
+        # Notified after every written batch, for callers waiting on a single meet
+        self.progress = asyncio.Condition()
+        self.task = None
+        self.failing = False
+        self.stats = {"appended": 0, "written": 0, "batches": 0, "spilled": 0, "dropped": 0, "errors": 0}
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def append(self, meetID: str, message: str, sender: str):
+        self.start()
+        self.buffer.append({
+            "_id": ObjectId(),
+            "meet_id": meetID,
+            "message": message,
+            "sender": sender,
+            "sentAt": datetime.utcnow()
+        })
+        self.stats["appended"] += 1
+        # Wake an idle flusher, or cut its wait short once a batch is full
+        if len(self.buffer) == 1 or len(self.buffer) >= JOURNAL_BATCH_SIZE:
+            self.wakeup.set()
+
+    async def _run(self):
+        backoff = JOURNAL_FLUSH_INTERVAL
+        while True:
+            if not self.buffer and not self.hasSpill():
+                self.flushed.set()
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                self.wakeup.clear()
+            self.flushed.clear()
+
+            if len(self.buffer) < JOURNAL_BATCH_SIZE and not self.failing:
+                # Let a partial batch fill up for a moment
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), JOURNAL_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+
+            if await self.writeOnce():
+                backoff = JOURNAL_FLUSH_INTERVAL
+                async with self.progress:
+                    self.progress.notify_all()
+            else:
+                self.spillOverflow()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, JOURNAL_MAX_BACKOFF)
+
+    async def writeOnce(self) -> bool:
+        """Write the spill file (if any), then one batch. False if Mongo refused."""
+        try:
+            if self.hasSpill():
+                await self.replaySpill()
+
+            batch = [self.buffer[i] for i in range(min(JOURNAL_BATCH_SIZE, len(self.buffer)))]
+            if batch:
+                await self.assignSeq(batch)
+                await self.insert(batch)
+                for _ in batch:
+                    self.buffer.popleft()
+
+            if self.failing:
+                logger.info("Message journal writes recovered")
+            self.failing = False
+            return True
+
+        except PyMongoError as e:
+            self.stats["errors"] += 1
+            if not self.failing:
+                logger.warning("Message journal write failed, buffering: %s", e)
+            self.failing = True
+            return False
+
+    async def assignSeq(self, batch: list):
+        for doc in batch:
+            if "seq" in doc:
+                continue
+            meetID = doc["meet_id"]
+            if meetID not in self.next_seq:
+                last = await self.collection.find_one(
+                    {"meet_id": meetID, "seq": {"$exists": True}},
+                    {"seq": 1},
+                    sort=[("seq", DESCENDING)]
+                )
+                self.next_seq[meetID] = last["seq"] + 1 if last else 1
+            doc["seq"] = self.next_seq[meetID]
+            self.next_seq[meetID] += 1
+
+    async def insert(self, docs: list):
+        try:
+            await self.collection.insert_many(docs, ordered=True)
+        except BulkWriteError as e:
+            # Ordered insert stops at the first bad document: skip it and write the rest
+            errors = e.details.get("writeErrors", [])
+            if not errors:
+                raise
+            error = errors[0]
+            if error["code"] != DUPLICATE_KEY:
+                # Already written by an earlier attempt is fine; anything else will never succeed
+                self.stats["dropped"] += 1
+                logger.error("Message journal dropped a message: %s", error.get("errmsg"))
+            written = error["index"]
+            self.stats["written"] += written
+            rest = docs[written + 1:]
+            if rest:
+                await self.insert(rest)
+            return
+        self.stats["written"] += len(docs)
+        self.stats["batches"] += 1
+
+    def hasSpill(self) -> bool:
+        return os.path.exists(JOURNAL_SPILL_PATH) and os.path.getsize(JOURNAL_SPILL_PATH) > 0
+
+    def spillOverflow(self, keep: int = JOURNAL_MAX_BUFFER):
+        """Move the oldest buffered messages beyond `keep` to the spill file."""
+        overflow = len(self.buffer) - keep
+        if overflow <= 0:
+            return
+
+        size = os.path.getsize(JOURNAL_SPILL_PATH) if os.path.exists(JOURNAL_SPILL_PATH) else 0
+        with open(JOURNAL_SPILL_PATH, "a") as f:
+            for _ in range(overflow):
+                doc = self.buffer.popleft()
+                line = json_util.dumps(doc) + "\n"
+                if size + len(line) > JOURNAL_SPILL_MAX_BYTES:
+                    self.stats["dropped"] += 1
+                    continue
+                f.write(line)
+                size += len(line)
+                self.stats["spilled"] += 1
+
+        if self.stats["dropped"]:
+            logger.error("Message journal spill file full, %s messages dropped so far", self.stats["dropped"])
+
+    async def replaySpill(self):
+        with open(JOURNAL_SPILL_PATH) as f:
+            docs = [json_util.loads(line) for line in f if line.strip()]
+        for i in range(0, len(docs), JOURNAL_BATCH_SIZE):
+            batch = docs[i:i + JOURNAL_BATCH_SIZE]
+            await self.assignSeq(batch)
+            await self.insert(batch)
+        os.remove(JOURNAL_SPILL_PATH)
+        logger.info("Replayed %s spilled messages", len(docs))
+
+    def pending(self, meetID: str) -> bool:
+        """True while a message of this meet may still be unwritten.
+
+        The spill file is not indexed by meet, so while it exists every meet counts as pending.
+        """
+        return self.hasSpill() or any(doc["meet_id"] == meetID for doc in self.buffer)
+
+    async def flush(self, meetID: str | None = None, timeout: float = JOURNAL_FLUSH_TIMEOUT) -> bool:
+        """Wait until everything appended so far (or only this meet's messages) is written; False on timeout."""
+        if meetID is not None:
+            return await self.flushMeet(meetID, timeout)
+        if not self.buffer and not self.hasSpill():
+            return True
+        self.start()
+        self.flushed.clear()
+        self.wakeup.set()
+        try:
+            await asyncio.wait_for(self.flushed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def flushMeet(self, meetID: str, timeout: float) -> bool:
+        if not self.pending(meetID):
+            return True
+        self.start()
+        # Skip the wait for a partial batch to fill up
+        self.wakeup.set()
+
+        async def written():
+            async with self.progress:
+                await self.progress.wait_for(lambda: not self.pending(meetID))
+
+        try:
+            await asyncio.wait_for(written(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def forget(self, meetID: str):
+        """Drop a finished meet's sequence counter; it is reloaded if the meet resumes."""
+        if not any(doc["meet_id"] == meetID for doc in self.buffer):
+            self.next_seq.pop(meetID, None)
+
+    async def close(self):
+        """Flush what Mongo will take, spill the rest, stop the flusher."""
+        flushed = await self.flush()
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        if not flushed:
+            self.spillOverflow(keep=0)
+            logger.warning("Message journal closed with unwritten messages spilled to %s", JOURNAL_SPILL_PATH)
+
+    def getStats(self):
+        return {**self.stats, "buffered": len(self.buffer), "failing": self.failing}
+
+
+journal = MessageJournal(messages)
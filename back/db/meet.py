@@ -1,39 +1,39 @@
-from pymongo import MongoClient
 from datetime import datetime
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["CrackEM"]
-meets = db["meets"]
-sessions = db["sessions"]
+from pymongo.errors import DuplicateKeyError
 
-def makeMeet(sessionID: str, meetID: str, total_questions: int, technical_topics: list, dsa_questions: list):
-    session = sessions.find_one({"session_id": sessionID})
+from back.db.allMeetFunctions import insertMeet
 
-    if not session:
+CANDIDATE_TOPICS = ['intro of candidate', 'strengths and weaknesses', 'tech stack', 'candidate preferences', 'interests']
+
+
+def topicFingerprint(technical_topics: list, dsa_questions: list):
+    """Normalized topic names (difficulty stripped), used to spot repeated topic sets."""
+    return sorted({t.rsplit(" - ", 1)[0].strip().lower() for t in technical_topics + dsa_questions})
+
+
+async def makeMeet(user_id, meetID: str, total_questions: int, technical_topics: list, dsa_questions: list, prepared_questions: dict | None = None):
+    try:
+        await insertMeet({
+            "user_id": user_id,
+            "meet_id": meetID,
+            "total_questions": total_questions+2,
+            "candidate_questions": list(CANDIDATE_TOPICS),
+            "technical_questions": technical_topics,
+            "dsa_questions": dsa_questions,
+            "topic_fingerprint": topicFingerprint(technical_topics, dsa_questions),
+            # Opening questions rendered ahead of time, keyed by topic category
+            "prepared_questions": prepared_questions or {},
+            "question_asked": 0,
+            "createdAt": datetime.utcnow()
+        })
+    except DuplicateKeyError:
         return {
             "status": "error",
-            "message": "User not found"
+            "message": "Meet already exists"
         }
 
-    user_id = session["user_id"]
-
-    meets.insert_one({
-        "user_id": user_id,
-        "meet_id": meetID,
-        "total_questions": total_questions+2,
-        "candidate_questions": ['intro of candidate', 'strengths and weaknesses', 'tech stack', 'candidate preferences', 'interests'],
-        "technical_questions": technical_topics,
-        "dsa_questions": dsa_questions,
-        "question_asked": 0,
-        "createdAt": datetime.utcnow()
-    })
-    print("MONGO INSERTED ID:")
-
     return {
         "status": "success",
         "message": "Meet created successfully"
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,28 @@
+from back.db.allMeetFunctions import getMeet, consumeTopic
+
+
+class MeetState:
+    """In-memory copy of a meet document for one interview session.
+
+    Loaded once when the transcript WebSocket opens; agents read from it
+    instead of calling `getMeet`, and writes go through to Mongo.
+    """
+
+    def __init__(self, meet: dict):
+        self.meetID = meet["meet_id"]
+        self.meet = meet
+        # Bumped on every write so derived work (e.g. a drafted question) can tell it is stale
+        self.version = 0
+        # True while the question on the table is a follow-up; never follow up on a follow-up
+        self.followup_asked = False
+
+    @classmethod
+    async def load(cls, meetID: str):
+        return cls(await getMeet(meetID))
+
+    async def consumeTopic(self, topic_category: str, topic: str):
+        await consumeTopic(self.meetID, topic_category, topic)
+
+        self.meet[topic_category] = [t for t in self.meet[topic_category] if t != topic]
+        self.meet["question_asked"] += 1
+        self.version += 1
@@ -0,0 +1,42 @@
+import os
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from back.metrics import MongoCommandTimer
+
+load_dotenv()
+
+MONGO_URI = os.getenv("MONGO_URI")
+if not MONGO_URI:
+    raise Exception("❌ MONGO_URI not found in .env")
+
+MONGO_DB = os.getenv("MONGO_DB", "CrackEM")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+
+# The only Mongo client in the process; every repository module shares its pool
+if MONGO_URI.startswith("mongomock://"):
+    # In-memory database for benchmarks and local runs without a mongod
+    from mongomock_motor import AsyncMongoMockClient
+    client = AsyncMongoMockClient()
+else:
+    client = AsyncIOMotorClient(
+        MONGO_URI,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        event_listeners=[MongoCommandTimer()]
+    )
+db = client[MONGO_DB]
+
+meets = db["meets"]
+messages = db["messages"]
+sessions = db["sessions"]
+users = db["users"]
+questionPool = db["question_pool"]
+answerScores = db["answer_scores"]
+meetScores = db["meet_scores"]
+jobState = db["job_state"]
+
+
+def closeClient():
+    client.close()
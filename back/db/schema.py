@@ -0,0 +1,165 @@
+"""Indexes and data migrations, applied at startup.
+
+    python -m back.db.schema            # apply migrations and indexes
+    python -m back.db.schema --check    # also explain the hot queries; exit 1 on a collection scan
+"""
+import sys
+import asyncio
+import logging
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from back.db.mongo import db, meets, messages, sessions, users, questionPool, answerScores
+
+logger = logging.getLogger(__name__)
+
+# Matches the session cookie's max_age in back/db/signin.py
+SESSION_TTL_SECONDS = 60 * 60 * 24
+
+INDEXES = [
+    (meets, [
+        IndexModel([("meet_id", ASCENDING)], name="meet_id_unique", unique=True),
+        IndexModel([("createdAt", DESCENDING)], name="createdAt"),
+        # A user's meets, newest first, for exports
+        IndexModel([("user_id", ASCENDING), ("createdAt", DESCENDING)], name="user_id_createdAt")
+    ]),
+    (sessions, [
+        IndexModel([("session_id", ASCENDING)], name="session_id_unique", unique=True),
+        IndexModel([("createdAt", ASCENDING)], name="createdAt_ttl", expireAfterSeconds=SESSION_TTL_SECONDS)
+    ]),
+    (users, [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True)
+    ]),
+    (messages, [
+        # Transcript order; _id breaks sentAt ties so keyset pages never skip or repeat
+        IndexModel([("meet_id", ASCENDING), ("sentAt", ASCENDING), ("_id", ASCENDING)], name="meet_id_sentAt_id"),
+        # The journal looks up the last sequence number per meet
+        IndexModel([("meet_id", ASCENDING), ("seq", DESCENDING)], name="meet_id_seq"),
+        # The scoring job finds meets with activity since its watermark
+        IndexModel([("sentAt", ASCENDING)], name="sentAt")
+    ]),
+    (questionPool, [
+        IndexModel([("kind", ASCENDING), ("createdAt", ASCENDING)], name="kind_createdAt")
+    ]),
+    (answerScores, [
+        IndexModel([("meet_id", ASCENDING), ("askedAt", ASCENDING)], name="meet_id_askedAt")
+    ])
+]
+
+migrations = db["schema_migrations"]
+
+
+# ---------- Migrations ----------
+
+async def backfillSessionCreatedAt():
+    """Sessions written before createdAt existed would never expire under the TTL index."""
+    result = await sessions.update_many(
+        {"createdAt": {"$exists": False}},
+        {"$set": {"createdAt": datetime.utcnow()}}
+    )
+    return {"updated": result.modified_count}
+
+
+# (version, name, coroutine function); append only, never renumber
+MIGRATIONS = [
+    (1, "backfill sessions.createdAt", backfillSessionCreatedAt)
+]
+
+
+async def runMigrations():
+    """Apply each migration once. The version document doubles as a lock between processes."""
+    for version, name, migrate in MIGRATIONS:
+        try:
+            await migrations.insert_one({"_id": version, "name": name, "state": "running", "startedAt": datetime.utcnow()})
+        except DuplicateKeyError:
+            # Applied already, or another process is applying it now
+            continue
+
+        try:
+            result = await migrate()
+        except Exception as e:
+            await migrations.delete_one({"_id": version})
+            logger.error("Migration %s (%s) failed: %s", version, name, e)
+            raise
+
+        await migrations.update_one(
+            {"_id": version},
+            {"$set": {"state": "applied", "appliedAt": datetime.utcnow(), "result": result}}
+        )
+        logger.info("Applied migration %s (%s): %s", version, name, result)
+
+
+# ---------- Indexes ----------
+
+async def ensureIndexes():
+    for collection, indexes in INDEXES:
+        try:
+            await collection.create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. existing duplicates blocking a unique index; the app still works without it
+            logger.error("Could not create indexes on %s: %s", collection.name, e)
+
+
+async def ensureSchema():
+    await runMigrations()
+    await ensureIndexes()
+
+
+# ---------- Explain-plan check ----------
+
+# The lookups on the request path; each must be served by an index
+HOT_QUERIES = [
+    (meets, {"meet_id": "explain-check"}, None),
+    (sessions, {"session_id": "explain-check"}, None),
+    (users, {"email": "explain-check@example.com"}, None),
+    (messages, {"meet_id": "explain-check"}, [("sentAt", ASCENDING), ("_id", ASCENDING)]),
+    (messages, {"meet_id": "explain-check", "$or": [
+        {"sentAt": {"$gt": datetime(2000, 1, 1)}},
+        {"sentAt": datetime(2000, 1, 1), "_id": {"$gt": ObjectId("000000000000000000000000")}}
+    ]}, [("sentAt", ASCENDING), ("_id", ASCENDING)]),
+    (meets, {"user_id": ObjectId("000000000000000000000000")}, [("createdAt", DESCENDING)]),
+    (messages, {"meet_id": "explain-check", "seq": {"$exists": True}}, [("seq", DESCENDING)]),
+    (questionPool, {"kind": "topics"}, [("createdAt", ASCENDING)]),
+    (messages, {"sentAt": {"$gt": datetime(2000, 1, 1)}}, None)
+]
+
+
+def planStages(plan: dict):
+    yield plan.get("stage")
+    for child in plan.get("inputStages", []) + [plan.get("inputStage")]:
+        if child:
+            yield from planStages(child)
+
+
+async def explainHotQueries():
+    """Return (collection, filter, winning stages) for each hot query."""
+    report = []
+    for collection, query, sort in HOT_QUERIES:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = (await cursor.explain())["queryPlanner"]["winningPlan"]
+        # Servers using the slot-based engine nest the classic plan one level down
+        plan = plan.get("queryPlan", plan)
+        report.append((collection.name, query, list(planStages(plan))))
+    return report
+
+
+async def check() -> bool:
+    await ensureSchema()
+    ok = True
+    for name, query, stages in await explainHotQueries():
+        scan = "COLLSCAN" in stages
+        ok = ok and not scan
+        print(f"{'FAIL' if scan else 'ok  '} {name} {query}: {' <- '.join(stages)}")
+    return ok
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if "--check" in sys.argv:
+        sys.exit(0 if asyncio.run(check()) else 1)
+    asyncio.run(ensureSchema())
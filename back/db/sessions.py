@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from back.db.mongo import sessions
+
+async def getSession(session_id: str):
+    return await sessions.find_one({"session_id": session_id})
+
+async def deleteSession(session_id: str):
+    await sessions.delete_one({"session_id": session_id})
+
+async def insertSession(session_id: str, user_id):
+    await sessions.insert_one({
+        "session_id": session_id,
+        "user_id": user_id,
+        # Expired by the TTL index in back/db/schema.py
+        "createdAt": datetime.utcnow()
+    })
@@ -1,32 +1,34 @@
-from pymongo import MongoClient
-import bcrypt
-from fastapi import Response, HTTPException
+from fastapi import Response
 import secrets
-from dotenv import load_dotenv
-import os
+import logging
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["CrackEM"]
-users = db["users"]
-sessions = db["sessions"]
+from back.db.users import getUserByEmail, updatePassword
+from back.db.sessions import insertSession
+from back.services.passwords import hasher, PasswordBusy
 
-def getUser(email: str, password: str, response: Response):
-    user = users.find_one({"email": email})
+logger = logging.getLogger(__name__)
+
+async def getUser(email: str, password: str, response: Response):
+    user = await getUserByEmail(email)
 
     if not user:
         return {"status": "error", "message": "User not found"}
 
-    if not bcrypt.checkpw(password.encode("utf-8"), user["password"]):
-        return {"status": "error", "message": "Invalid password"}
+    try:
+        if not await hasher.verify(password, user["password"]):
+            return {"status": "error", "message": "Invalid password"}
+
+        if hasher.needsRehash(user["password"]):
+            # BCRYPT_ROUNDS changed since this hash was made; the plain password is only available now
+            await updatePassword(user["_id"], await hasher.hash(password))
+            hasher.stats["rehashed"] += 1
+    except PasswordBusy:
+        logger.warning("Sign-in refused, password workers saturated")
+        return {"status": "error", "message": "Too many sign-in attempts right now, please try again"}
 
     session_id = secrets.token_urlsafe(32)
 
-    sessions.insert_one({
-        "session_id": session_id,
-        "user_id": user["_id"]
-    })
+    await insertSession(session_id, user["_id"])
 
     response.set_cookie(
         key="session_id",
@@ -44,5 +46,3 @@ def getUser(email: str, password: str, response: Response):
             "email": user["email"]
         }
     }
-
-# print(getUser("Test User", "test@123", "password123"))
\ No newline at end of file
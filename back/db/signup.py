@@ -1,34 +1,39 @@
-from pymongo import MongoClient
 from datetime import datetime
-import bcrypt
-from dotenv import load_dotenv
-import os
+from pymongo.errors import DuplicateKeyError
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["CrackEM"]
-users = db["users"]
+from back.db.users import getUserByEmail, createUser
+from back.services.passwords import hasher, PasswordBusy
 
-def insertUser(name: str, email: str, password):
-    user = users.find_one({"email": email})
+async def insertUser(name: str, email: str, password):
+    user = await getUserByEmail(email)
     if user:
         return {
             "status": "error",
             "message": "User with this email already exists."
         }
     else:
-        hashedPassword = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-        users.insert_one({
-            "name": name,
-            "email": email,
-            "password": hashedPassword,
-            "joinDate": datetime.utcnow().isoformat()
-        })
-        
+        try:
+            hashedPassword = await hasher.hash(password)
+        except PasswordBusy:
+            return {
+                "status": "error",
+                "message": "Too many sign-ups right now, please try again."
+            }
+        try:
+            await createUser({
+                "name": name,
+                "email": email,
+                "password": hashedPassword,
+                "joinDate": datetime.utcnow().isoformat()
+            })
+        except DuplicateKeyError:
+            # Lost a race with a concurrent sign-up for the same email
+            return {
+                "status": "error",
+                "message": "User with this email already exists."
+            }
+
         return {
             "status": "success",
             "message": "User registered successfully."
         }
-        
-# print(insertUser("Test User", "test@123", "password123"))
\ No newline at end of file
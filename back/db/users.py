@@ -0,0 +1,13 @@
+from back.db.mongo import users
+
+async def getUserByEmail(email: str):
+    return await users.find_one({"email": email})
+
+async def getUserById(user_id):
+    return await users.find_one({"_id": user_id})
+
+async def createUser(user: dict):
+    await users.insert_one(user)
+
+async def updatePassword(user_id, hashedPassword: bytes):
+    await users.update_one({"_id": user_id}, {"$set": {"password": hashedPassword}})
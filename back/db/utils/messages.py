@@ -1,19 +1,68 @@
-from pymongo import MongoClient
+import base64
 from datetime import datetime
-from dotenv import load_dotenv
-import os
 
+from bson import ObjectId
+from pymongo import ASCENDING
+
+from back.db.mongo import messages
+from back.db.journal import journal
+
+# Fields a reader needs; the rest of the document stays on the server
+MESSAGE_FIELDS = {"_id": 1, "seq": 1, "sender": 1, "message": 1, "sentAt": 1}
+TRANSCRIPT_ORDER = [("sentAt", ASCENDING), ("_id", ASCENDING)]
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client['CrackEM']
-messages = db['messages']
 
 def putMessage(meetID: str, message: str, sender: str):
-    messages.insert_one({
-        "meet_id": meetID,
-        "message": message,
-        "sender": sender,
-        "sentAt": datetime.utcnow()
-    })
\ No newline at end of file
+    """Queue a message for the write-behind journal; it is stored within JOURNAL_FLUSH_INTERVAL."""
+    journal.append(meetID, message, sender)
+
+
+def messageRow(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "seq": doc.get("seq"),
+        "sender": doc["sender"],
+        "message": doc["message"],
+        "sentAt": doc["sentAt"].isoformat()
+    }
+
+
+def encodeCursor(doc: dict) -> str:
+    raw = f"{doc['sentAt'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decodeCursor(cursor: str):
+    """(sentAt, _id) of the last message on the previous page; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sent_at, _id = raw.split("|")
+        return datetime.fromisoformat(sent_at), ObjectId(_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def getMessagesPage(meetID: str, after: str | None = None, limit: int = 50):
+    """One page of a meet's transcript in order, and the cursor of the next page (or None).
+
+    Keyset pagination on (sentAt, _id): each page starts right after the last
+    row of the previous one through the index, however deep the page is.
+    """
+    query = {"meet_id": meetID}
+    if after:
+        sent_at, _id = decodeCursor(after)
+        query["$or"] = [
+            {"sentAt": {"$gt": sent_at}},
+            {"sentAt": sent_at, "_id": {"$gt": _id}}
+        ]
+
+    docs = await messages.find(query, MESSAGE_FIELDS).sort(TRANSCRIPT_ORDER).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encodeCursor(docs[limit - 1]) if len(docs) > limit else None
+    return [messageRow(doc) for doc in docs[:limit]], next_cursor
+
+
+async def iterMessages(meetID: str, batch_size: int = 500):
+    """Every message of a meet in order, fetched from the cursor a batch at a time."""
+    cursor = messages.find({"meet_id": meetID}, MESSAGE_FIELDS).sort(TRANSCRIPT_ORDER).batch_size(batch_size)
+    async for doc in cursor:
+        yield messageRow(doc)
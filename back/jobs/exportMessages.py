@@ -0,0 +1,69 @@
+"""Export every interview transcript of a user as NDJSON.
+
+    python -m back.jobs.exportMessages --email someone@example.com --out transcripts.ndjson
+    python -m back.jobs.exportMessages --email someone@example.com --out transcripts.ndjson.gz
+    python -m back.jobs.exportMessages --email someone@example.com          # to stdout
+
+One line per message, tagged with its meet_id; meets newest first, messages
+in transcript order. Meets and messages are both read from cursors and
+written as they arrive, so memory use does not grow with the export.
+"""
+import sys
+import gzip
+import json
+import asyncio
+import logging
+import argparse
+
+from back.db.allMeetFunctions import iterUserMeets
+from back.db.users import getUserByEmail
+from back.db.utils.messages import iterMessages
+from back.db.mongo import closeClient as closeMongoClient
+
+logger = logging.getLogger(__name__)
+
+
+def openOutput(path: str | None):
+    if not path or path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+async def export(email: str, out) -> dict:
+    user = await getUserByEmail(email)
+    if not user:
+        raise SystemExit(f"No user with email {email}")
+
+    counts = {"meets": 0, "messages": 0}
+    async for meet in iterUserMeets(user["_id"]):
+        counts["meets"] += 1
+        async for row in iterMessages(meet["meet_id"]):
+            out.write(json.dumps({"meet_id": meet["meet_id"], **row}) + "\n")
+            counts["messages"] += 1
+    return counts
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Export a user's interview transcripts as NDJSON")
+    parser.add_argument("--email", required=True, help="account whose meets are exported")
+    parser.add_argument("--out", help="output file; .gz is compressed, omitted or - writes to stdout")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parseArgs(argv)
+    out = openOutput(args.out)
+    try:
+        counts = await export(args.email, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        closeMongoClient()
+    logger.info("Exported %s messages from %s meets", counts["messages"], counts["meets"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
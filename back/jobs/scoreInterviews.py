@@ -0,0 +1,256 @@
+"""Score finished interviews, incrementally, outside the live server.
+
+    python -m back.jobs.scoreInterviews                  # score meets finished since the last run
+    python -m back.jobs.scoreInterviews --workers 8      # more meets in flight at once
+    python -m back.jobs.scoreInterviews --reset          # forget the watermark and rescore everything
+
+A meet counts as finished once it has had no messages for SCORE_IDLE_MINUTES.
+Each run looks only at meets with messages newer than the stored watermark,
+pairs every interviewer question with the candidate's reply, and scores the
+pairs SCORE_BATCH_SIZE to an LLM call. Results are upserted into
+`answer_scores` (one document per answer) and `meet_scores` (one per meet),
+so rerunning is harmless. `meet_scores.scoredThrough` doubles as the
+checkpoint: after a crash the same run resumes and skips meets already done.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, UpdateOne
+
+from ai.agents.scoringAgent import scoreAnswers
+from ai.llmClient import closeClient as closeLLMClient
+from back.db.mongo import messages, meetScores, answerScores, jobState, closeClient as closeMongoClient
+from back.db.schema import ensureSchema
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = "scoreInterviews"
+SCORE_IDLE_MINUTES = float(os.getenv("SCORE_IDLE_MINUTES", "30"))
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", "4"))
+SCORE_BATCH_SIZE = int(os.getenv("SCORE_BATCH_SIZE", "5"))
+# Answers shorter than this are scored without an LLM call
+SCORE_MIN_ANSWER_CHARS = int(os.getenv("SCORE_MIN_ANSWER_CHARS", "3"))
+INTERVIEWER = "Jarvis"
+
+
+# ---------- Run state ----------
+
+async def startRun(reset: bool, idle_minutes: float):
+    """The watermark and cutoff of this run; an interrupted run is resumed with its own cutoff."""
+    if reset:
+        await jobState.delete_one({"_id": JOB_ID})
+
+    state = await jobState.find_one({"_id": JOB_ID}) or {}
+    watermark = state.get("watermark", datetime.min)
+    run = state.get("run")
+    if run:
+        logger.info("Resuming run started %s", run["startedAt"])
+        return watermark, run["cutoff"]
+
+    cutoff = datetime.utcnow() - timedelta(minutes=idle_minutes)
+    await jobState.update_one(
+        {"_id": JOB_ID},
+        {"$set": {"run": {"cutoff": cutoff, "startedAt": datetime.utcnow()}}},
+        upsert=True
+    )
+    return watermark, cutoff
+
+
+async def finishRun(cutoff: datetime, report: dict):
+    await jobState.update_one(
+        {"_id": JOB_ID},
+        {"$set": {"watermark": cutoff, "lastReport": report}, "$unset": {"run": ""}}
+    )
+
+
+async def finishedMeets(watermark: datetime, cutoff: datetime):
+    """(meet_id, last message time) of meets active since the watermark and idle since the cutoff.
+
+    Meets still active after the cutoff are left for a later run; their newer
+    messages keep them past the next watermark.
+    """
+    pipeline = [
+        {"$match": {"sentAt": {"$gt": watermark}}},
+        {"$group": {"_id": "$meet_id", "last": {"$max": "$sentAt"}}},
+        {"$match": {"last": {"$lte": cutoff}}},
+        {"$sort": {"last": ASCENDING}}
+    ]
+    async for group in messages.aggregate(pipeline, allowDiskUse=True):
+        yield group["_id"], group["last"]
+
+
+# ---------- Scoring ----------
+
+async def answerPairs(meetID: str):
+    """Yield one dict per answered question, streaming the meet's messages in order.
+
+    Consecutive candidate messages (an answer split by a cancelled turn) are
+    joined; the answer is identified by its first message.
+    """
+    question, answer = None, None
+    cursor = messages.find(
+        {"meet_id": meetID},
+        {"message": 1, "sender": 1, "sentAt": 1}
+    ).sort([("sentAt", ASCENDING), ("seq", ASCENDING)])
+
+    async for message in cursor:
+        if message["sender"] == INTERVIEWER:
+            if answer:
+                yield answer
+            question, answer = message, None
+        elif question:
+            if answer:
+                answer["answer"] += " " + message["message"]
+            else:
+                answer = {
+                    "_id": message["_id"],
+                    "question": question["message"],
+                    "answer": message["message"],
+                    "askedAt": question["sentAt"]
+                }
+    if answer:
+        yield answer
+
+
+async def scoreBatch(meetID: str, batch: list, stats: dict):
+    short = [a for a in batch if len(a["answer"].strip()) < SCORE_MIN_ANSWER_CHARS]
+    scored = [a for a in batch if a not in short]
+
+    results = []
+    if scored:
+        stats["llm_calls"] += 1
+        results = await scoreAnswers([(a["question"], a["answer"]) for a in scored])
+
+    writes = []
+    for answer, result in list(zip(scored, results)) + [(a, {"score": 1, "feedback": "No answer was given."}) for a in short]:
+        if result is None:
+            stats["unscored"] += 1
+        writes.append(UpdateOne(
+            {"_id": answer["_id"]},
+            {"$set": {
+                "meet_id": meetID,
+                "question": answer["question"],
+                "answer": answer["answer"],
+                "askedAt": answer["askedAt"],
+                "score": result["score"] if result else None,
+                "feedback": result["feedback"] if result else None,
+                "scoredAt": datetime.utcnow()
+            }},
+            upsert=True
+        ))
+    if writes:
+        await answerScores.bulk_write(writes, ordered=False)
+    return [r["score"] for r in results if r] + [1] * len(short)
+
+
+async def scoreMeet(meetID: str, last: datetime, batch_size: int, stats: dict):
+    done = await meetScores.find_one({"_id": meetID}, {"scoredThrough": 1})
+    if done and done.get("scoredThrough") and done["scoredThrough"] >= last:
+        stats["skipped"] += 1
+        return
+
+    scores, batch, answers = [], [], 0
+    async for answer in answerPairs(meetID):
+        answers += 1
+        batch.append(answer)
+        if len(batch) >= batch_size:
+            scores += await scoreBatch(meetID, batch, stats)
+            batch = []
+    if batch:
+        scores += await scoreBatch(meetID, batch, stats)
+
+    # Written last: its presence means every answer above is stored
+    await meetScores.update_one(
+        {"_id": meetID},
+        {"$set": {
+            "answers": answers,
+            "scored": len(scores),
+            "score": round(sum(scores) / len(scores), 2) if scores else None,
+            "scoredThrough": last,
+            "scoredAt": datetime.utcnow()
+        }},
+        upsert=True
+    )
+    stats["meets"] += 1
+    stats["answers"] += answers
+
+
+async def run(args) -> dict:
+    await ensureSchema()
+    watermark, cutoff = await startRun(args.reset, args.idle_minutes)
+    logger.info("Scoring meets with messages after %s, idle since %s", watermark, cutoff)
+
+    stats = {"meets": 0, "answers": 0, "llm_calls": 0, "skipped": 0, "unscored": 0, "failed": 0}
+    queue = asyncio.Queue(maxsize=args.workers * 2)
+    started = time.perf_counter()
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            meetID, last = item
+            try:
+                await scoreMeet(meetID, last, args.batch_size, stats)
+            except Exception as e:
+                stats["failed"] += 1
+                logger.warning("Scoring meet %s failed: %s", meetID, e)
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.workers)]
+    found = 0
+    async for item in finishedMeets(watermark, cutoff):
+        await queue.put(item)
+        found += 1
+        if args.limit and found >= args.limit:
+            break
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+    elapsed = time.perf_counter() - started
+    report = {
+        **stats,
+        "found": found,
+        "seconds": round(elapsed, 2),
+        "meets_per_minute": round(stats["meets"] / elapsed * 60, 2) if elapsed else None,
+        "watermark": cutoff.isoformat()
+    }
+    # A failed or cut-short run keeps the old watermark; the checkpoints skip what it finished
+    if not stats["failed"] and not (args.limit and found >= args.limit):
+        await finishRun(cutoff, report)
+    else:
+        report["watermark"] = None
+    return report
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Score finished interviews since the last run")
+    parser.add_argument("--workers", type=int, default=SCORE_WORKERS, help="meets scored concurrently")
+    parser.add_argument("--batch-size", type=int, default=SCORE_BATCH_SIZE, help="answers per LLM call")
+    parser.add_argument("--idle-minutes", type=float, default=SCORE_IDLE_MINUTES,
+                        help="minutes without messages after which a meet counts as finished")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many meets (watermark is kept)")
+    parser.add_argument("--reset", action="store_true", help="forget the watermark and rescore every meet")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parseArgs(argv)
+    try:
+        report = await run(args)
+    finally:
+        await closeLLMClient()
+        closeMongoClient()
+    print(json.dumps(report, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,62 @@
+import os
+import time
+import logging
+import threading
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# At most LOG_RATE_LIMIT records per message template per LOG_RATE_WINDOW seconds
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", "10"))
+# Loggers whose records are one per event and must all be kept, e.g. per-turn traces
+LOG_RATE_EXEMPT = ("crackem.trace",)
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeats of the same message template beyond a per-window budget.
+
+    Keyed on the unformatted message, so `logger.info("x %s", a)` calls share
+    one budget whatever their arguments. Warnings and errors are never dropped,
+    nor are records from the `exempt` loggers (or their children). The first
+    record after a window that dropped any reports how many.
+    """
+
+    def __init__(self, limit: int, window: float, exempt: tuple = ()):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.exempt = exempt
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.limit <= 0:
+            return True
+        if any(record.name == name or record.name.startswith(name + ".") for name in self.exempt):
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            started, count, dropped = self.counts.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                if dropped:
+                    record.msg = f"{record.msg} [{dropped} similar messages suppressed]"
+                started, count, dropped = now, 0, 0
+
+            if count >= self.limit:
+                self.counts[key] = (started, count, dropped + 1)
+                return False
+
+            self.counts[key] = (started, count + 1, dropped)
+            return True
+
+
+def configureLogging():
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # Filters on handlers see records from every logger, not just the root
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(f, RateLimitFilter) for f in handler.filters):
+            handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT, LOG_RATE_WINDOW, LOG_RATE_EXEMPT))
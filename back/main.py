@@ -1,25 +1,58 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from ai.llmClient import closeClient as closeLLMClient, getPromptEvalStats
+from ai.prefilter import getStats as getPrefilterStats
+from ai.scheduler import scheduler
+from ai.verdictCache import verdictCache
+from back.db.mongo import closeClient as closeMongoClient
+from back.db.journal import journal
+from back.db.schema import ensureSchema
+from back.services.sessionResolver import resolver
+from back.services.passwords import hasher
+from back.services.sessionStore import store as sessionStore
+from back.services.questionPool import runPoolWorker, QUESTION_POOL_ENABLED
+from back.logConfig import configureLogging
+from back.metrics import renderMetrics
+
 # router imports
 from back.routes.user.sign import router as user_router
 from back.routes.ws.transcript import router as ws_router
 from back.routes.meet.creation import router as meetCreation_router
 from back.routes.meet.welcome import router as welcome_router
+from back.routes.meet.messages import router as messages_router
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configureLogging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Interview AI Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ensureSchema()
+    except Exception as e:
+        logger.error("Schema setup failed, continuing without it: %s", e)
+    # Also replays messages spilled to disk by a previous run
+    journal.start()
+    pool_worker = asyncio.create_task(runPoolWorker()) if QUESTION_POOL_ENABLED else None
+    yield
+    if pool_worker:
+        pool_worker.cancel()
+    await journal.close()
+    await sessionStore.close()
+    await closeLLMClient()
+    closeMongoClient()
+    hasher.close()
+
+app = FastAPI(title="Interview AI Backend", lifespan=lifespan)
 
 app.include_router(user_router)
 app.include_router(ws_router)
 app.include_router(meetCreation_router)
 app.include_router(welcome_router)
+app.include_router(messages_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,4 +68,22 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/stats")
+async def stats():
+    return {
+        "llm": getPromptEvalStats(),
+        "scheduler": scheduler.getStats(),
+        "prefilter": getPrefilterStats(),
+        "verdicts": verdictCache.getStats(),
+        "journal": journal.getStats(),
+        "sessions": resolver.getStats(),
+        "passwords": hasher.getStats()
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = renderMetrics()
+    return Response(content=body, media_type=content_type)
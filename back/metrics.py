@@ -0,0 +1,198 @@
+import json
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from pymongo import monitoring
+
+from ai.scheduler import scheduler, PRIORITY_NAMES
+
+logger = logging.getLogger("crackem.trace")
+
+# Seconds; turns are dominated by LLM calls, Mongo calls by the low buckets
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+TURN_STAGE_SECONDS = Histogram(
+    "crackem_turn_stage_seconds",
+    "Time spent in each stage of a candidate turn",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+LLM_PHASE_SECONDS = Histogram(
+    "crackem_llm_phase_seconds",
+    "LLM call time per agent: queue wait, prompt eval, time to first token, generation, total",
+    ["agent", "phase"],
+    buckets=STAGE_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "crackem_llm_tokens_total",
+    "Tokens evaluated by the model server per agent",
+    ["agent", "kind"]
+)
+MONGO_SECONDS = Histogram(
+    "crackem_mongo_command_seconds",
+    "Mongo command round trips by command name",
+    ["command", "outcome"],
+    buckets=MONGO_BUCKETS
+)
+ENDPOINT_SECONDS = Histogram(
+    "crackem_endpoint_decision_seconds",
+    "Silence waited after the candidate's last speech before answering, by ending cue",
+    ["cue"],
+    buckets=STAGE_BUCKETS
+)
+TURNS = Counter(
+    "crackem_turns_total",
+    "Finished candidate turns by outcome",
+    ["outcome"]
+)
+ACTIVE_SESSIONS = Gauge(
+    "crackem_active_sessions",
+    "Open interview WebSockets"
+)
+LLM_IN_FLIGHT = Gauge(
+    "crackem_llm_in_flight",
+    "LLM calls currently holding a scheduler slot"
+)
+LLM_IN_FLIGHT.set_function(lambda: scheduler.in_flight)
+LLM_QUEUE_DEPTH = Gauge(
+    "crackem_llm_queue_depth",
+    "LLM calls waiting for a scheduler slot",
+    ["priority"]
+)
+for _priority, _name in PRIORITY_NAMES.items():
+    LLM_QUEUE_DEPTH.labels(_name).set_function(lambda p=_priority: scheduler.queueDepth(p))
+
+VERDICT_CACHE = Counter(
+    "crackem_verdict_cache_total",
+    "Validation/follow-up verdict lookups by the tier that answered (or miss)",
+    ["agent", "result"]
+)
+PASSWORD_SECONDS = Histogram(
+    "crackem_password_seconds",
+    "bcrypt hash/verify time spent waiting for a worker and working",
+    ["op", "phase"],
+    buckets=STAGE_BUCKETS
+)
+PASSWORD_WAITING = Gauge(
+    "crackem_password_waiting",
+    "bcrypt operations waiting for a worker thread"
+)
+PASSWORD_REJECTED = Counter(
+    "crackem_password_rejected_total",
+    "bcrypt operations refused because too many were already queued"
+)
+
+# Stage timings of the turn being handled; tasks spawned inside a turn share it
+currentTrace = contextvars.ContextVar("turn_trace", default=None)
+
+
+class TurnTrace:
+    """Collects span durations for one turn and logs them as a single JSON line."""
+
+    def __init__(self, meetID: str, turn: int, start: float | None = None):
+        self.meetID = meetID
+        self.turn = turn
+        self.start = time.perf_counter() if start is None else start
+        self.spans = {}
+        self.outcome = None
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] = round(self.spans.get(name, 0) + seconds * 1000, 1)
+
+    def mark(self, name: str):
+        """Record time since the turn started, once per name (e.g. first chunk sent)."""
+        if name not in self.spans:
+            seconds = time.perf_counter() - self.start
+            TURN_STAGE_SECONDS.labels(name).observe(seconds)
+            self.add(name, seconds)
+
+    def finish(self):
+        total = time.perf_counter() - self.start
+        TURN_STAGE_SECONDS.labels("total").observe(total)
+        TURNS.labels(self.outcome or "error").inc()
+        logger.info("%s", json.dumps({
+            "event": "turn",
+            "meet_id": self.meetID,
+            "turn": self.turn,
+            "outcome": self.outcome or "error",
+            "total_ms": round(total * 1000, 1),
+            "spans_ms": self.spans
+        }))
+
+
+@contextmanager
+def trace(meetID: str, turn: int, start: float | None = None):
+    turn_trace = TurnTrace(meetID, turn, start)
+    token = currentTrace.set(turn_trace)
+    try:
+        yield turn_trace
+    finally:
+        currentTrace.reset(token)
+        turn_trace.finish()
+
+
+def record(stage: str, seconds: float):
+    TURN_STAGE_SECONDS.labels(stage).observe(seconds)
+    turn_trace = currentTrace.get()
+    if turn_trace:
+        turn_trace.add(stage, seconds)
+
+
+def mark(name: str):
+    turn_trace = currentTrace.get()
+    if turn_trace:
+        turn_trace.mark(name)
+
+
+def setOutcome(outcome: str):
+    turn_trace = currentTrace.get()
+    if turn_trace:
+        turn_trace.outcome = outcome
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block as a turn stage, in the histogram and the current trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def recordLLMPhase(agent: str, phase: str, seconds: float):
+    LLM_PHASE_SECONDS.labels(agent, phase).observe(seconds)
+    turn_trace = currentTrace.get()
+    if turn_trace:
+        turn_trace.add(f"{agent}.{phase}", seconds)
+
+
+def recordLLMUsage(agent: str, usage: dict):
+    """Server-reported prompt-eval and generation time, from the final usage block."""
+    if usage.get("prompt_eval_duration"):
+        recordLLMPhase(agent, "prompt_eval", usage["prompt_eval_duration"] / 1e9)
+    if usage.get("eval_duration"):
+        recordLLMPhase(agent, "generation", usage["eval_duration"] / 1e9)
+    LLM_TOKENS.labels(agent, "prompt").inc(usage.get("prompt_eval_count", 0))
+    LLM_TOKENS.labels(agent, "generated").inc(usage.get("eval_count", 0))
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Times every command the driver sends, so no call site needs wrapping."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_SECONDS.labels(event.command_name, "ok").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_SECONDS.labels(event.command_name, "error").observe(event.duration_micros / 1e6)
+
+
+def renderMetrics():
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,6 +1,11 @@
-from ai.agents.initializerAgent import getTopicsForInterview
-from fastapi import APIRouter, Request
+import logging
+
+from fastapi import APIRouter, Depends
 from back.db.meet import makeMeet
+from back.services.questionPool import takeInterviewSetup
+from back.services.sessionResolver import currentUser
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/meet",
@@ -8,18 +13,16 @@ router = APIRouter(
 )
 
 @router.get("/create")
-async def create_meet(meetID: str, request: Request):
-    session = request.cookies.get("session_id")    
-    if not session:
-        return {"error": "Not logged in"}   
-    
-    print("CALLING getTopicsForInterview()")
-    topics = getTopicsForInterview()
-    print("TOPICS RECEIVED:", topics)
+async def create_meet(meetID: str, user: dict | None = Depends(currentUser)):
+    if not user:
+        return {"error": "Not logged in"}
+
+    topics, prepared_questions = await takeInterviewSetup()
+    logger.debug("Topics for meet %s: %s", meetID, topics)
 
     total_questions = len(topics["technical_topics"]) + len(topics["dsa_questions"])
     
-    result = makeMeet(session, meetID, total_questions, topics["technical_topics"], topics["dsa_questions"])
-    
-    print("\nmeet created\n")
-    return result
\ No newline at end of file
+    result = await makeMeet(user["_id"], meetID, total_questions, topics["technical_topics"], topics["dsa_questions"], prepared_questions)
+
+    logger.info("Meet %s created", meetID)
+    return result
@@ -0,0 +1,82 @@
+import re
+import json
+import zlib
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from back.db.allMeetFunctions import userOwnsMeet
+from back.db.journal import journal
+from back.db.utils.messages import getMessagesPage, iterMessages
+from back.services.sessionResolver import currentUser
+
+router = APIRouter(
+    prefix="/meet",
+    tags=["meet_messages"],
+)
+
+# Reads wait at most this long for the meet's buffered messages, so a live interview's last ones are included
+READ_FLUSH_TIMEOUT = 1.0
+
+
+async def ndjsonLines(meetID: str):
+    async for row in iterMessages(meetID):
+        yield (json.dumps(row) + "\n").encode("utf-8")
+
+
+async def gzipped(chunks):
+    # wbits=31 writes a gzip header, so the output is a regular .gz file
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@router.get("/{meetID}/messages")
+async def get_messages(
+    meetID: str,
+    after: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    user: dict | None = Depends(currentUser)
+):
+    if not user:
+        return {"error": "Not logged in"}
+    if not await userOwnsMeet(meetID, user["_id"]):
+        return {"error": "Meet not found"}
+
+    await journal.flush(meetID, READ_FLUSH_TIMEOUT)
+    try:
+        rows, next_cursor = await getMessagesPage(meetID, after, limit)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return {"messages": rows, "next": next_cursor}
+
+
+@router.get("/{meetID}/messages/export")
+async def export_messages(
+    meetID: str,
+    format: str = Query("ndjson", pattern="^(ndjson|gzip)$"),
+    user: dict | None = Depends(currentUser)
+):
+    if not user:
+        return {"error": "Not logged in"}
+    if not await userOwnsMeet(meetID, user["_id"]):
+        return {"error": "Meet not found"}
+
+    await journal.flush(meetID, READ_FLUSH_TIMEOUT)
+    filename = re.sub(r"[^\w.-]", "_", meetID)
+    # Rows go out as the cursor yields them; the transcript is never held in memory
+    if format == "gzip":
+        return StreamingResponse(
+            gzipped(ndjsonLines(meetID)),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson.gz"'}
+        )
+    return StreamingResponse(
+        ndjsonLines(meetID),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'}
+    )
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends
 from back.services.welcome import sayFirstMessage
+from back.services.sessionResolver import currentUser
 
 router = APIRouter(
     prefix="/meet",
@@ -7,9 +8,8 @@ router = APIRouter(
 )
 
 @router.post("/welcome")
-async def welcome_user(meetID: str, request: Request):
-    session_id = request.cookies.get("session_id") 
-    message = sayFirstMessage(session_id, meetID)
+async def welcome_user(meetID: str, user: dict | None = Depends(currentUser)):
+    message = await sayFirstMessage(user, meetID)
     
     return {
         "message": message
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Request, Response
 
 from back.db.signin import getUser
 from back.db.signup import insertUser
+from back.db.sessions import deleteSession
+from back.services.sessionResolver import resolver, SESSION_COOKIE
 from back.schema.user import SignupRequest, SigninRequest
 
 router = APIRouter(
@@ -11,7 +13,7 @@ router = APIRouter(
 
 @router.post("/signup")
 async def signup_user(data: SignupRequest):
-    result = insertUser(data.username, data.email, data.password)
+    result = await insertUser(data.username, data.email, data.password)
 
     if result.get("status") == "success":
         return {"status": "success", "message": result.get("message", "Sign-up successful")}
@@ -21,7 +23,7 @@ async def signup_user(data: SignupRequest):
 
 @router.post("/signin")
 async def signin_user(data: SigninRequest, response: Response):
-    result = getUser(data.email, data.password, response)
+    result = await getUser(data.email, data.password, response)
 
     if result.get("status") == "success":
         return {
@@ -33,4 +35,15 @@ async def signin_user(data: SigninRequest, response: Response):
         return {
             "status": "error",
             "message": result.get("message", "Invalid credentials")
-        }
\ No newline at end of file
+        }
+
+
+@router.post("/signout")
+async def signout_user(request: Request, response: Response):
+    session_id = request.cookies.get(SESSION_COOKIE)
+    if session_id:
+        await deleteSession(session_id)
+        resolver.invalidate(session_id)
+
+    response.delete_cookie(key=SESSION_COOKIE, httponly=True, samesite="lax")
+    return {"status": "success", "message": "Signed out"}
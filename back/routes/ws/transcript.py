@@ -4,31 +4,106 @@ import json
 import asyncio
 import time
 
-from back.utils.sentenceEnhancer import enhance
+from back.utils.sentenceEnhancer import TranscriptEnhancer
 from back.db.utils.messages import putMessage
-from ai.agents.mainAgent import startAgent
-from ai.agents.validationAgent import validate
-from ai.agents.followupAgent import followUp
+from back.db.journal import journal
+from back.services.sessionResolver import websocketUser
+from back.db.meetState import MeetState
+from back.services.turn import runTurn, Lookahead, TurnManager
+from back.services.sessionStore import loadState, saveState
+from back.services.frames import FrameWriter, negotiate
+from ai.scheduler import currentSession
+from back.metrics import ACTIVE_SESSIONS, trace, record, span, setOutcome
+from back.services.endpointing import EndOfTurnDetector
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.websocket("/ws/transcript")
-async def websocket_transcript(websocket: WebSocket, meetID: str | None = None, lastLLMResponse: str | None = None):
-    await websocket.accept()
-    # State
-    last_transcript = ""
-    transcript_version = 0
-    # Store lastLLMResponse as a local variable that can be updated
-    current_last_response = lastLLMResponse  # Initialize from query param if provided
+async def websocket_transcript(websocket: WebSocket, meetID: str | None = None, lastLLMResponse: str | None = None, protocol: str | None = None):
+    # Authenticated from the session cookie sent with the handshake
+    user = await websocketUser(websocket)
+    if not user:
+        await websocket.close(code=1008)
+        return
+
+    # Meet document is read once per session; agents share this cached copy
+    try:
+        meet_state = await MeetState.load(meetID)
+    except Exception as e:
+        logger.error(f"Could not load meet {meetID}: {e}")
+        await websocket.close(code=1008)
+        return
+
+    if meet_state.meet.get("user_id") != user["_id"]:
+        logger.warning("User %s tried to join meet %s they do not own", user["_id"], meetID)
+        await websocket.close(code=1008)
+        return
+
+    # Old clients get one JSON frame per token; newer ones ask for coalesced frames
+    wire_protocol, subprotocol = negotiate(websocket, protocol)
+    await websocket.accept(subprotocol=subprotocol)
+    frames = FrameWriter(websocket, wire_protocol)
+
+    # Each connection runs in its own task, so this tags every LLM call it makes
+    currentSession.set(meetID)
+    lookahead = Lookahead(meet_state)
+    # Loaded inside the try below; None until then so cleanup skips saving it
+    state = None
+
+    async def process(answer: str, version: int, waited: float):
+        # Answer of a turn cancelled because the candidate kept talking; this
+        # turn judges it together with what they added. It is already in the
+        # transcript, so only this turn's own text is stored below
+        carried = state.pending
+        state.pending = ""
+        full_answer = f"{carried} {answer}".strip()
+        stored = False
+
+        # The turn is timed from the candidate's last words, not from the decision
+        with trace(meetID, version, start=time.perf_counter() - waited):
+            record("endpoint", waited)
+            try:
+                with span("enhance"):
+                    answer = await enhancer.finalize(answer)
+                full_answer = f"{carried} {answer}".strip()
+                putMessage(meetID, answer, "user")
+                stored = True
+
+                state.last_response = await runTurn(frames, meet_state, lookahead, state.last_response, full_answer)
+                state.followup_asked = meet_state.followup_asked
+                await saveState(state)
+
+            except asyncio.CancelledError:
+                setOutcome("cancelled")
+                # Cancelled before the cleanup finished: keep the raw text rather than lose it
+                if not stored:
+                    putMessage(meetID, answer, "user")
+                state.pending = full_answer
+            except Exception as e:
+                logger.error("Error processing answer: %s", e, exc_info=True)
+
+    def onEndOfTurn(answer: str, waited: float, cue: str):
+        state.version += 1
+        # Queued behind any turn still saving its answer
+        turns.submit(answer, state.version, waited)
 
-    ENHANCE_DELAY = 0.8  # seconds
+    # Decides when the candidate has finished, from interim/final timing and wording
+    detector = EndOfTurnDetector(onEndOfTurn)
+    # Cleans committed answers; its LLM pass starts while the detector is still waiting
+    enhancer = TranscriptEnhancer()
+    turns = TurnManager(frames, process)
 
     try:
-        print("\n" + "="*50)
-        print("Interview session started - Listening for transcriptions...")
-        print("="*50 + "\n")
+        ACTIVE_SESSIONS.inc()
+        # Current question, turn count and unanswered text live in the session
+        # store, so a reconnect (to this worker or another) resumes the interview
+        state = await loadState(meetID, lastLLMResponse)
+        meet_state.followup_asked = state.followup_asked
+        # Start drafting the first question right away
+        lookahead.start()
+        logger.info("Interview session started for meet %s", meetID)
 
         while True:
             data = await websocket.receive_text()
@@ -36,137 +111,59 @@ async def websocket_transcript(websocket: WebSocket, meetID: str | None = None,
             try:
                 message = json.loads(data)
 
-                # --- UPDATE: Extract lastLLMResponse from message ---
-                if message.get("lastLLMResponse"):
-                    current_last_response = message.get("lastLLMResponse")
-                    # print(f"[DEBUG] Updated lastLLMResponse from message: {current_last_response[:100] if current_last_response else 'None'}", flush=True)
+                # The server's record of the question wins; the client's copy only fills a gap
+                if message.get("lastLLMResponse") and not state.last_response:
+                    state.last_response = message.get("lastLLMResponse")
 
-                # --- Interim messages (just logging) ---
+                # --- Interim messages: the candidate is still talking ---
                 if message.get("type") == "interim" and message.get("text"):
                     interim = message["text"].strip()
                     if interim:
-                        print(f"[USER - interim]: {interim}", flush=True)
+                        logger.debug("[USER - interim]: %s", interim)
+                        detector.onInterim(interim)
+                        enhancer.observe(" ".join(detector.pending + [interim]), message.get("confidence"))
 
-                # --- Final transcript message ---
+                # --- Final transcript segment ---
                 if message.get("type") == "transcript" and message.get("text"):
                     transcript = message["text"].strip()
                     if not transcript:
                         continue
 
-                    print(f"[USER]: {transcript}", flush=True)
-
-                    last_transcript = transcript
-                    transcript_version += 1
-                    my_version = transcript_version
-
-                    # Debounced delayed processing
-                    async def delayed_process(text_snapshot: str, version_snapshot: int):
-                        nonlocal current_last_response  # ← Use current_last_response instead
-
-                        try:
-                            await asyncio.sleep(ENHANCE_DELAY)
-
-                            if version_snapshot != transcript_version:
-                                print(f"[DEBUG] Skipping stale transcript version {version_snapshot}", flush=True)
-                                return
-
-                            if not text_snapshot.strip():
-                                print(f"[DEBUG] Skipping empty transcript", flush=True)
-                                return
-
-                            putMessage(meetID, text_snapshot, "user")
-
-                            print(f"[DEBUG] Validating response...", flush=True)
-                            result = await validate(meetID, current_last_response or "", text_snapshot)
-                            print(f"[DEBUG] VALIDATION RESULT = {result}", flush=True)
-
-                            status = (result.get("status") or "").lower().strip()
-
-                            if status == "success":
-                                user_answer = text_snapshot
-
-                                if current_last_response and current_last_response.strip():
-                                    # print(f"[DEBUG] Checking followup for question: {current_last_response[:100]}", flush=True)
-                                    print(f"[DEBUG] User answer: {user_answer[:100]}", flush=True)
-                                    
-                                    followup_result = await followUp(meetID, current_last_response, user_answer)
-                                    print(f"\n\n[DEBUG] FOLLOWUP RESULT = {followup_result}", flush=True)
-                                    
-                                    if followup_result["status"] == "followup_needed":
-                                        followup_question = followup_result["message"]
-                                        print(f"[DEBUG] Sending followup question: {followup_question[:100]}", flush=True)
-
-                                        await websocket.send_text(json.dumps({
-                                            "type": "ai_response_chunk",
-                                            "text": followup_question
-                                        }))
-
-                                        await websocket.send_text(json.dumps({
-                                            "type": "ai_response_done"
-                                        }))
-
-                                        current_last_response = followup_question
-                                        print(f"[DEBUG] Updated current_last_response, exiting delayed_process", flush=True)
-                                        return
-                                    else:
-                                        print(f"[DEBUG] No followup needed, proceeding to main agent", flush=True)
-                                else:
-                                    print(f"[DEBUG] No current_last_response, skipping followup check", flush=True)
-
-                                print(f"[DEBUG] Starting main agent...", flush=True)
-                                final_answer = ""
-
-                                async for chunk in startAgent(meetID):
-                                    final_answer += chunk
-                                    await websocket.send_text(json.dumps({
-                                        "type": "ai_response_chunk",
-                                        "text": chunk
-                                    }))
-
-                                current_last_response = final_answer
-                                print(f"[DEBUG] Main agent complete, updated current_last_response", flush=True)
-
-                                await websocket.send_text(json.dumps({
-                                    "type": "ai_response_done"
-                                }))
-
-                            else:
-                                print(f"[DEBUG] Validation failed: {result.get('message')}", flush=True)
-                                msg = result.get("message", "Validation failed")
-                                
-                                await websocket.send_text(json.dumps({
-                                    "type": "ai_response_chunk",
-                                    "text": msg
-                                }))
-
-                                await websocket.send_text(json.dumps({
-                                    "type": "ai_response_done"
-                                }))
-
-                                current_last_response = msg
-                                return
-
-                        except asyncio.CancelledError:
-                            print(f"[DEBUG] delayed_process cancelled", flush=True)
-                            return
-                        except Exception as e:
-                            logger.error(f"[DEBUG] Error in delayed_process: {e}", exc_info=True)
-                            print(f"[DEBUG] Exception in delayed_process: {e}", flush=True)
-
-                    # Fire and forget task
-                    asyncio.create_task(delayed_process(transcript, my_version))
+                    logger.debug("[USER]: %s", transcript)
+                    # The candidate is still answering: stop replying to the earlier part
+                    detector.requeue([answer for answer, _, _ in await turns.cancel()])
+                    detector.onFinal(transcript)
+                    enhancer.observe(" ".join(detector.pending), message.get("confidence"))
 
             except Exception as e:
                 logger.warning(f"Error processing message: {e}", exc_info=True)
 
     except WebSocketDisconnect:
-        print("\n" + "="*50)
-        print("Interview session ended")
-        print("="*50 + "\n")
+        logger.info("Interview session ended for meet %s", meetID)
 
     except Exception as e:
         logger.error(f"Error in WebSocket connection: {e}", exc_info=True)
         try:
             await websocket.close()
         except:
-            pass
\ No newline at end of file
+            pass
+
+    finally:
+        ACTIVE_SESSIONS.dec()
+        detector.cancel()
+        enhancer.cancel()
+        unanswered = [answer for answer, _, _ in await turns.close()]
+        lookahead.discard()
+        frames.discard()
+        # Speech heard but not answered yet is stored now and judged by the next connection
+        leftover = " ".join(unanswered + detector.pending).strip()
+        if leftover:
+            putMessage(meetID, leftover, "user")
+        if state:
+            state.pending = " ".join([state.pending, leftover]).strip()
+            state.followup_asked = meet_state.followup_asked
+            await saveState(state)
+        # Persist this interview's messages before the session is considered over
+        if not await journal.flush(meetID):
+            logger.warning("Messages for meet %s still buffered after disconnect", meetID)
+        journal.forget(meetID)
@@ -0,0 +1,148 @@
+import os
+import re
+import time
+import asyncio
+import logging
+
+from back.metrics import ENDPOINT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Bounds on how long to wait after a final transcript before answering
+TURN_MIN_DELAY = float(os.getenv("TURN_MIN_DELAY", "0.15"))
+TURN_MAX_DELAY = float(os.getenv("TURN_MAX_DELAY", "2.0"))
+# Starting guess for a candidate's mid-answer pause, refined as they speak
+TURN_DEFAULT_PAUSE = float(os.getenv("TURN_DEFAULT_PAUSE", "0.5"))
+# Commit anyway if interim text stops without a final transcript following it
+TURN_INTERIM_TIMEOUT = float(os.getenv("TURN_INTERIM_TIMEOUT", "3.0"))
+
+# Cue classes, also used as the metric label
+COMPLETE = "complete"
+NEUTRAL = "neutral"
+FRAGMENT = "fragment"
+TIMEOUT = "interim_timeout"
+
+# Words a finished sentence rarely ends on
+TRAILING_WORDS = {
+    "and", "but", "or", "so", "because", "since", "then", "if", "when", "while",
+    "which", "that", "who", "where", "like", "the", "a", "an", "to", "of", "in",
+    "on", "for", "with", "my", "our", "is", "are", "was", "um", "uh", "umm",
+    "uhh", "er", "basically", "also", "i", "we"
+}
+TRAILING_PHRASES = ("for example", "such as", "i mean", "you know", "let me think", "kind of", "sort of")
+TERMINAL_PUNCTUATION = re.compile(r"[.?!]['\")\]]*$")
+WORD = re.compile(r"[a-z']+")
+
+
+def classifyEnding(text: str) -> str:
+    """How finished a transcript sounds from its last words alone."""
+    text = text.strip().lower()
+    words = WORD.findall(text)
+    if not words:
+        return NEUTRAL
+    if text.endswith((",", "-", "...", ":")) or words[-1] in TRAILING_WORDS or text.endswith(TRAILING_PHRASES):
+        return FRAGMENT
+    if TERMINAL_PUNCTUATION.search(text):
+        return COMPLETE
+    return NEUTRAL
+
+
+class PauseProfile:
+    """EWMA of the pauses a candidate makes mid-answer, and of their spread."""
+
+    def __init__(self, mean: float = TURN_DEFAULT_PAUSE, alpha: float = 0.2):
+        self.mean = mean
+        self.deviation = mean / 4
+        self.alpha = alpha
+        self.samples = 0
+
+    def observe(self, pause: float):
+        pause = min(pause, TURN_MAX_DELAY * 2)
+        self.deviation = (1 - self.alpha) * self.deviation + self.alpha * abs(pause - self.mean)
+        self.mean = (1 - self.alpha) * self.mean + self.alpha * pause
+        self.samples += 1
+
+    @property
+    def threshold(self) -> float:
+        """A silence longer than most of this candidate's mid-answer pauses."""
+        return self.mean + 2 * self.deviation
+
+
+class EndOfTurnDetector:
+    """Decides when the candidate has finished answering.
+
+    Final transcript segments accumulate until a silence long enough for
+    the way the answer ends: short after a clearly finished sentence,
+    the candidate's usual pause threshold otherwise, and longer after a
+    trailing fragment ("... and", "because"). Interim text arriving while
+    a decision is pending means the candidate kept talking, so the wait
+    restarts and that pause is learned as a mid-answer one.
+
+    `on_commit(text, waited, cue)` is called with the whole answer.
+    """
+
+    def __init__(self, on_commit):
+        self.on_commit = on_commit
+        self.profile = PauseProfile()
+        self.pending = []
+        self.last_final_at = None
+        self.last_speech_at = None
+        self.timer = None
+
+    def delayFor(self, cue: str) -> float:
+        threshold = self.profile.threshold
+        if cue == COMPLETE:
+            delay = threshold / 2
+        elif cue == FRAGMENT:
+            delay = threshold * 2
+        else:
+            delay = threshold
+        return min(max(delay, TURN_MIN_DELAY), TURN_MAX_DELAY)
+
+    def onInterim(self, text: str):
+        if not text.strip() or not self.pending:
+            return
+        self.last_speech_at = time.perf_counter()
+        if self.last_final_at is not None:
+            # The candidate went on after a final segment: that silence was mid-answer
+            self.profile.observe(time.perf_counter() - self.last_final_at)
+            self.last_final_at = None
+        self.arm(TURN_INTERIM_TIMEOUT, TIMEOUT)
+
+    def onFinal(self, text: str):
+        text = text.strip()
+        if not text:
+            return
+        if self.pending and self.last_final_at is not None:
+            # Two finals without interim between them still mean speech continued
+            self.profile.observe(time.perf_counter() - self.last_final_at)
+        self.pending.append(text)
+        self.last_final_at = self.last_speech_at = time.perf_counter()
+
+        cue = classifyEnding(text)
+        self.arm(self.delayFor(cue), cue)
+
+    def requeue(self, answers: list):
+        """Put committed answers that were never handled back in front of the pending text."""
+        self.pending[0:0] = answers
+
+    def arm(self, delay: float, cue: str):
+        self.cancel()
+        self.timer = asyncio.create_task(self._commitAfter(delay, cue))
+
+    async def _commitAfter(self, delay: float, cue: str):
+        await asyncio.sleep(delay)
+        answer = " ".join(self.pending)
+        waited = time.perf_counter() - self.last_speech_at
+        self.pending = []
+        self.last_final_at = self.last_speech_at = None
+        self.timer = None
+
+        ENDPOINT_SECONDS.labels(cue).observe(waited)
+        logger.debug("End of turn (%s) after %.0fms: %s", cue, waited * 1000, answer)
+        self.on_commit(answer, waited, cue)
+
+    def cancel(self):
+        if self.timer and not self.timer.done():
+            self.timer.cancel()
+        self.timer = None
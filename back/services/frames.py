@@ -0,0 +1,128 @@
+import os
+import json
+import asyncio
+import logging
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Coalesced modes hold streamed text for at most this long, or until this many bytes
+FRAME_FLUSH_INTERVAL = float(os.getenv("FRAME_FLUSH_INTERVAL", "0.03"))
+FRAME_MAX_BYTES = int(os.getenv("FRAME_MAX_BYTES", "512"))
+
+# Wire protocols. JSON is the original one frame per token and stays the default.
+JSON = "json"
+BATCHED = "batched"
+MSGPACK = "msgpack"
+
+# Sec-WebSocket-Protocol names; clients that cannot set one use ?protocol=
+SUBPROTOCOLS = {
+    "crackem.batched.v1": BATCHED,
+    "crackem.msgpack.v1": MSGPACK
+}
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def negotiate(websocket: WebSocket, requested: str | None = None):
+    """Pick (protocol, subprotocol to accept) from what the client offered.
+
+    Offered subprotocols are tried in the client's order; msgpack is skipped
+    when the package is not installed. Without a usable offer the query
+    parameter decides, and anything unknown gets plain JSON.
+    """
+    for offered in websocket.scope.get("subprotocols", []):
+        protocol = SUBPROTOCOLS.get(offered)
+        if protocol == MSGPACK and msgpack is None:
+            continue
+        if protocol:
+            return protocol, offered
+
+    if requested == MSGPACK and msgpack is not None:
+        return MSGPACK, None
+    if requested in (BATCHED, MSGPACK):
+        return BATCHED, None
+    return JSON, None
+
+
+class FrameWriter:
+    """Sends interviewer output to one client in its negotiated protocol.
+
+    In the JSON protocol every streamed chunk is its own text frame, as
+    before. The batched and msgpack protocols append chunks to a buffer that
+    goes out as one `ai_response_chunk` when FRAME_MAX_BYTES are waiting or
+    FRAME_FLUSH_INTERVAL after the first of them, so a reply costs a few
+    dozen frames instead of one per token. Other messages flush the buffer
+    first, keeping order; `discard` drops it when a turn is taken back.
+    """
+
+    def __init__(self, websocket: WebSocket, protocol: str = JSON):
+        self.websocket = websocket
+        self.protocol = protocol
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.timer = None
+        self.lock = asyncio.Lock()
+        self.stats = {"chunks": 0, "frames": 0}
+
+    @property
+    def coalescing(self) -> bool:
+        return self.protocol != JSON
+
+    async def chunk(self, text: str):
+        self.stats["chunks"] += 1
+        if not self.coalescing:
+            await self.send({"type": "ai_response_chunk", "text": text})
+            return
+
+        self.buffer.append(text)
+        self.buffered_bytes += len(text.encode("utf-8"))
+        if self.buffered_bytes >= FRAME_MAX_BYTES:
+            await self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.create_task(self._flushAfter(FRAME_FLUSH_INTERVAL))
+
+    async def _flushAfter(self, delay: float):
+        await asyncio.sleep(delay)
+        self.timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            # The socket is gone; the turn sending through it finds out on its next write
+            logger.debug("Deferred frame flush failed: %s", e)
+
+    async def flush(self):
+        self.cancelTimer()
+        if not self.buffer:
+            return
+        text = "".join(self.buffer)
+        self.buffer = []
+        self.buffered_bytes = 0
+        await self.write({"type": "ai_response_chunk", "text": text})
+
+    async def send(self, message: dict):
+        await self.flush()
+        await self.write(message)
+
+    async def write(self, message: dict):
+        async with self.lock:
+            if self.protocol == MSGPACK:
+                await self.websocket.send_bytes(msgpack.packb(message))
+            else:
+                await self.websocket.send_text(json.dumps(message))
+            self.stats["frames"] += 1
+
+    def discard(self):
+        """Forget buffered text of a cancelled reply."""
+        self.cancelTimer()
+        self.buffer = []
+        self.buffered_bytes = 0
+
+    def cancelTimer(self):
+        if self.timer and self.timer is not asyncio.current_task():
+            self.timer.cancel()
+        self.timer = None
@@ -0,0 +1,94 @@
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from back.metrics import PASSWORD_SECONDS, PASSWORD_WAITING, PASSWORD_REJECTED
+
+logger = logging.getLogger(__name__)
+
+# Cost factor for new hashes; stored hashes with a different cost are redone at the next sign-in
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads doing bcrypt work; it releases the GIL, so these run truly in parallel
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Operations allowed to wait for a worker before sign-ins are turned away
+PASSWORD_MAX_WAITING = int(os.getenv("PASSWORD_MAX_WAITING", "64"))
+
+
+class PasswordBusy(Exception):
+    """Too many hashes already queued; the caller should ask the user to retry."""
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop.
+
+    Hashing is deliberately slow CPU work, so calling it inline in a route
+    stalls every WebSocket on the worker. Here it runs on a small thread
+    pool, at most PASSWORD_WORKERS at a time; callers beyond that queue,
+    and past PASSWORD_MAX_WAITING they are refused with PasswordBusy
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_waiting: int, rounds: int):
+        self.rounds = rounds
+        self.max_waiting = max_waiting
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.slots = asyncio.Semaphore(workers)
+        self.waiting = 0
+        self.stats = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0}
+
+    async def run(self, op: str, fn, *args):
+        if self.waiting >= self.max_waiting:
+            self.stats["rejected"] += 1
+            PASSWORD_REJECTED.inc()
+            raise PasswordBusy()
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        PASSWORD_WAITING.inc()
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+            PASSWORD_WAITING.dec()
+
+        try:
+            started = time.perf_counter()
+            PASSWORD_SECONDS.labels(op, "queue").observe(started - queued)
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            PASSWORD_SECONDS.labels(op, "work").observe(time.perf_counter() - started)
+            return result
+        finally:
+            self.slots.release()
+
+    async def hash(self, password: str) -> bytes:
+        hashed = await self.run("hash", self._hash, password.encode("utf-8"))
+        self.stats["hashed"] += 1
+        return hashed
+
+    async def verify(self, password: str, hashed: bytes) -> bool:
+        ok = await self.run("verify", bcrypt.checkpw, password.encode("utf-8"), hashed)
+        self.stats["verified"] += 1
+        return ok
+
+    def _hash(self, password: bytes) -> bytes:
+        return bcrypt.hashpw(password, bcrypt.gensalt(rounds=self.rounds))
+
+    def needsRehash(self, hashed: bytes) -> bool:
+        """True if the stored hash was made with a different cost ($2b$<cost>$...)."""
+        try:
+            return int(hashed.split(b"$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def getStats(self):
+        return {**self.stats, "waiting": self.waiting, "rounds": self.rounds}
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+hasher = PasswordHasher(PASSWORD_WORKERS, PASSWORD_MAX_WAITING, BCRYPT_ROUNDS)
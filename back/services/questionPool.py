@@ -0,0 +1,256 @@
+import os
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+
+from ai.agents.initializerAgent import generateTopics, getTopicsForInterview
+from ai.agents.starterAgent import invokeStarterAgent
+from ai.agents.technicalAgent import invokeTechnicalAgent
+from ai.scheduler import currentPriority, BACKGROUND
+from back.db.mongo import meets, questionPool, jobState
+from back.db.meet import CANDIDATE_TOPICS, topicFingerprint
+
+logger = logging.getLogger(__name__)
+
+QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "true").lower() == "true"
+POOL_LOW_WATERMARK = int(os.getenv("POOL_LOW_WATERMARK", "3"))
+POOL_HIGH_WATERMARK = int(os.getenv("POOL_HIGH_WATERMARK", "10"))
+POOL_CHECK_INTERVAL = float(os.getenv("POOL_CHECK_INTERVAL", "60"))
+# Topic sets sharing more than this fraction of topics with a recent one are dropped
+POOL_MAX_OVERLAP = float(os.getenv("POOL_MAX_OVERLAP", "0.5"))
+POOL_RECENT_MEETS = int(os.getenv("POOL_RECENT_MEETS", "50"))
+POOL_MAX_ATTEMPTS = int(os.getenv("POOL_MAX_ATTEMPTS", "3"))
+# Only the worker holding the lease refills; it lapses if that worker dies mid-refill
+POOL_LEASE_SECONDS = float(os.getenv("POOL_LEASE_SECONDS", "120"))
+# First wait after a failed generation, doubled per failure up to POOL_MAX_BACKOFF
+POOL_RETRY_DELAY = float(os.getenv("POOL_RETRY_DELAY", "5"))
+POOL_MAX_BACKOFF = float(os.getenv("POOL_MAX_BACKOFF", "300"))
+
+POOL_LEASE_ID = "questionPoolRefill"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Set whenever an entry is claimed so the worker checks the watermark right away
+_refill = asyncio.Event()
+
+
+def overlap(a: list, b: list) -> float:
+    a, b = set(a), set(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+async def renderQuestion(agent, topics: list):
+    """Run a question agent to completion and return its final message."""
+    final = None
+    async for msg in agent(topics):
+        if msg["type"] == "final":
+            final = msg
+    if final and final["topic_name"] in topics:
+        return {"question": final["question"], "topic_name": final["topic_name"]}
+    return None
+
+
+async def recentFingerprints():
+    fingerprints = []
+    async for meet in meets.find({}, {"topic_fingerprint": 1}).sort("createdAt", DESCENDING).limit(POOL_RECENT_MEETS):
+        fingerprints.append(meet.get("topic_fingerprint") or [])
+    async for entry in questionPool.find({"kind": "topics"}, {"fingerprint": 1}):
+        fingerprints.append(entry["fingerprint"])
+    return fingerprints
+
+
+async def hasRoom(kind: str, lost: asyncio.Event) -> bool:
+    """Whether this worker may still add an entry of `kind`.
+
+    Checked again right before each insert, since a generation can take long
+    enough for claims or another worker to change the count.
+    """
+    if lost.is_set():
+        return False
+    return await questionPool.count_documents({"kind": kind}) < POOL_HIGH_WATERMARK
+
+
+async def addTopicSet(recent: list, lost: asyncio.Event):
+    """True once a set is added, None if the pool no longer has room, False if generation failed."""
+    for _ in range(POOL_MAX_ATTEMPTS):
+        topics = await generateTopics()
+        if topics is None:
+            continue
+
+        fingerprint = topicFingerprint(topics["technical_topics"], topics["dsa_questions"])
+        if any(overlap(fingerprint, seen) > POOL_MAX_OVERLAP for seen in recent):
+            logger.info("Dropping duplicate topic set")
+            continue
+
+        opening = await renderQuestion(invokeTechnicalAgent, topics["technical_topics"])
+        if not await hasRoom("topics", lost):
+            return None
+        await questionPool.insert_one({
+            "kind": "topics",
+            "technical_topics": topics["technical_topics"],
+            "dsa_questions": topics["dsa_questions"],
+            "fingerprint": fingerprint,
+            "opening_question": opening,
+            "createdAt": datetime.utcnow()
+        })
+        recent.append(fingerprint)
+        return True
+
+    return False
+
+
+async def addOpeningQuestion(lost: asyncio.Event):
+    opening = await renderQuestion(invokeStarterAgent, CANDIDATE_TOPICS)
+    if opening is None:
+        return False
+    if not await hasRoom("opening", lost):
+        return None
+
+    await questionPool.insert_one({
+        "kind": "opening",
+        **opening,
+        "createdAt": datetime.utcnow()
+    })
+    return True
+
+
+async def acquireLease() -> bool:
+    """Take or extend the refill lease; False while another worker holds it."""
+    now = datetime.utcnow()
+    try:
+        await jobState.update_one(
+            {"_id": POOL_LEASE_ID, "$or": [{"holder": WORKER_ID}, {"expiresAt": {"$lt": now}}]},
+            {"$set": {"holder": WORKER_ID, "expiresAt": now + timedelta(seconds=POOL_LEASE_SECONDS)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # The lease document exists and is held by someone else
+        return False
+
+
+async def releaseLease():
+    await jobState.delete_one({"_id": POOL_LEASE_ID, "holder": WORKER_ID})
+
+
+async def keepLease(lost: asyncio.Event):
+    """Renew the lease while a refill runs; a single generation can outlast it."""
+    while True:
+        await asyncio.sleep(POOL_LEASE_SECONDS / 3)
+        try:
+            renewed = await acquireLease()
+        except Exception as e:
+            logger.warning("Question pool lease renewal failed: %s", e)
+            continue
+        if not renewed:
+            logger.warning("Question pool lease taken over, stopping this refill")
+            lost.set()
+            return
+
+
+async def refillPool() -> bool:
+    """Top both pools up to the high watermark once either drops below the low one.
+
+    Returns False if a generation failed, so the caller can back off.
+    """
+    if not await acquireLease():
+        return True
+
+    lost = asyncio.Event()
+    heartbeat = asyncio.create_task(keepLease(lost))
+    try:
+        ok = True
+        if await questionPool.count_documents({"kind": "topics"}) < POOL_LOW_WATERMARK:
+            recent = await recentFingerprints()
+            while await hasRoom("topics", lost):
+                added = await addTopicSet(recent, lost)
+                if not added:
+                    ok = added is None
+                    break
+
+        if await questionPool.count_documents({"kind": "opening"}) < POOL_LOW_WATERMARK:
+            while await hasRoom("opening", lost):
+                added = await addOpeningQuestion(lost)
+                if not added:
+                    ok = ok and added is None
+                    break
+
+        logger.info(
+            "Question pool: %s topic sets, %s opening questions",
+            await questionPool.count_documents({"kind": "topics"}),
+            await questionPool.count_documents({"kind": "opening"})
+        )
+        return ok
+    finally:
+        heartbeat.cancel()
+        await releaseLease()
+
+
+async def runPoolWorker():
+    # Pool refills only ever use LLM capacity that live interviews leave idle
+    currentPriority.set(BACKGROUND)
+    backoff = POOL_RETRY_DELAY
+
+    while True:
+        try:
+            ok = await refillPool()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Question pool refill failed: %s", e)
+            ok = False
+
+        if not ok:
+            # Claims would otherwise retry a failing generator on every new meet
+            logger.info("Question pool refill incomplete, retrying in %ss", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, POOL_MAX_BACKOFF)
+            continue
+        backoff = POOL_RETRY_DELAY
+
+        _refill.clear()
+        try:
+            await asyncio.wait_for(_refill.wait(), timeout=POOL_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def claim(kind: str):
+    entry = await questionPool.find_one_and_delete({"kind": kind}, sort=[("createdAt", ASCENDING)])
+    _refill.set()
+    return entry
+
+
+async def takeInterviewSetup():
+    """Topics and prepared opening questions for a new meet.
+
+    Served from the pool when possible; falls back to live generation only
+    when the pool is empty or disabled.
+    """
+    prepared_questions = {}
+
+    topic_set = await claim("topics") if QUESTION_POOL_ENABLED else None
+    if topic_set:
+        topics = {
+            "technical_topics": topic_set["technical_topics"],
+            "dsa_questions": topic_set["dsa_questions"]
+        }
+        if topic_set.get("opening_question"):
+            prepared_questions["technical_questions"] = topic_set["opening_question"]
+    else:
+        logger.info("No pooled topic set, generating live")
+        topics = await getTopicsForInterview()
+
+    opening = await claim("opening") if QUESTION_POOL_ENABLED else None
+    if opening:
+        prepared_questions["candidate_questions"] = {
+            "question": opening["question"],
+            "topic_name": opening["topic_name"]
+        }
+
+    return topics, prepared_questions
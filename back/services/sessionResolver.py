@@ -0,0 +1,106 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import Request, WebSocket
+
+from back.db.mongo import sessions
+from back.db.schema import SESSION_TTL_SECONDS
+
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "300"))
+# Unknown session ids are remembered briefly so a bad cookie cannot hammer Mongo
+SESSION_NEGATIVE_TTL = float(os.getenv("SESSION_NEGATIVE_TTL", "30"))
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+
+SESSION_COOKIE = "session_id"
+
+
+class SessionResolver:
+    """session_id -> user, cached with a TTL and LRU eviction.
+
+    A miss costs one aggregate (session joined to its user) instead of two
+    find_one calls, and concurrent misses for the same id share it. Entries
+    never outlive the session itself. Sign-out invalidates the local entry;
+    other processes see it within SESSION_CACHE_TTL.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, max_size: int):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        # session_id -> (expires_at, user or None)
+        self.cache = OrderedDict()
+        self.loading = {}
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    async def resolve(self, session_id: str | None):
+        if not session_id:
+            return None
+
+        entry = self.cache.get(session_id)
+        if entry and entry[0] > time.monotonic():
+            self.cache.move_to_end(session_id)
+            self.stats["hits" if entry[1] else "negative_hits"] += 1
+            return entry[1]
+
+        self.stats["misses"] += 1
+        if session_id not in self.loading:
+            self.loading[session_id] = asyncio.ensure_future(self._load(session_id))
+        try:
+            return await asyncio.shield(self.loading[session_id])
+        finally:
+            if self.loading.get(session_id) and self.loading[session_id].done():
+                del self.loading[session_id]
+
+    async def _load(self, session_id: str):
+        pipeline = [
+            {"$match": {"session_id": session_id}},
+            {"$limit": 1},
+            {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "_id", "as": "user"}},
+            {"$project": {"createdAt": 1, "user._id": 1, "user.name": 1, "user.email": 1}}
+        ]
+        found = await sessions.aggregate(pipeline).to_list(1)
+
+        if not found or not found[0]["user"]:
+            self.store(session_id, None, self.negative_ttl)
+            return None
+
+        user = found[0]["user"][0]
+        ttl = self.ttl
+        created = found[0].get("createdAt")
+        if created:
+            remaining = SESSION_TTL_SECONDS - (datetime.utcnow() - created).total_seconds()
+            if remaining <= 0:
+                self.store(session_id, None, self.negative_ttl)
+                return None
+            ttl = min(ttl, remaining)
+
+        self.store(session_id, user, ttl)
+        return user
+
+    def store(self, session_id: str, user, ttl: float):
+        self.cache[session_id] = (time.monotonic() + ttl, user)
+        self.cache.move_to_end(session_id)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    def invalidate(self, session_id: str):
+        self.cache.pop(session_id, None)
+
+    def getStats(self):
+        return {**self.stats, "size": len(self.cache)}
+
+
+resolver = SessionResolver(SESSION_CACHE_TTL, SESSION_NEGATIVE_TTL, SESSION_CACHE_SIZE)
+
+
+async def currentUser(request: Request):
+    """FastAPI dependency: the signed-in user, or None."""
+    return await resolver.resolve(request.cookies.get(SESSION_COOKIE))
+
+
+async def websocketUser(websocket: WebSocket):
+    """The signed-in user for a WebSocket handshake, or None; the browser sends the cookie."""
+    return await resolver.resolve(websocket.cookies.get(SESSION_COOKIE))
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import logging
+
+from pymongo import DESCENDING
+
+from back.db.mongo import messages
+
+logger = logging.getLogger(__name__)
+
+# "memory" keeps state in this process; a redis:// URL shares it between workers and nodes
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "memory")
+# Idle interviews are forgotten after this long
+SESSION_STATE_TTL = int(os.getenv("SESSION_STATE_TTL", str(60 * 60 * 24)))
+
+
+class InterviewState:
+    """What a transcript session needs to pick an interview back up.
+
+    `last_response` is the question the candidate is answering, `version`
+    numbers the turns, and `pending` is answer text that was heard but not
+    yet answered (a cancelled turn, or speech cut off by a disconnect); the
+    next turn judges it together with whatever the candidate says next.
+    `followup_asked` is set while `last_response` is itself a follow-up, so a
+    resumed session does not follow up on it again.
+    """
+
+    def __init__(self, meetID: str, last_response: str | None = None, version: int = 0, pending: str = "", followup_asked: bool = False):
+        self.meetID = meetID
+        self.last_response = last_response
+        self.version = version
+        self.pending = pending
+        self.followup_asked = followup_asked
+
+    def toDict(self):
+        return {
+            "last_response": self.last_response,
+            "version": self.version,
+            "pending": self.pending,
+            "followup_asked": self.followup_asked
+        }
+
+    @classmethod
+    def fromDict(cls, meetID: str, data: dict):
+        return cls(meetID, data.get("last_response"), data.get("version", 0), data.get("pending", ""), data.get("followup_asked", False))
+
+
+class MemorySessionStore:
+    """Per-process store; only resumes reconnects that land on the same worker."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        # meetID -> (expires_at, state dict)
+        self.states = {}
+
+    async def get(self, meetID: str):
+        entry = self.states.get(meetID)
+        if not entry:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.states[meetID]
+            return None
+        return entry[1]
+
+    async def set(self, meetID: str, data: dict):
+        self.states[meetID] = (time.monotonic() + self.ttl, dict(data))
+        if len(self.states) % 1000 == 0:
+            self.prune()
+
+    async def delete(self, meetID: str):
+        self.states.pop(meetID, None)
+
+    def prune(self):
+        now = time.monotonic()
+        for meetID in [m for m, (expires, _) in self.states.items() if expires <= now]:
+            del self.states[meetID]
+
+    async def close(self):
+        pass
+
+
+class RedisSessionStore:
+    """Shared store: any worker can resume any interview. Needs the `redis` package."""
+
+    def __init__(self, url: str, ttl: int):
+        # Optional dependency, only imported when configured
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    def key(self, meetID: str):
+        return f"crackem:interview:{meetID}"
+
+    async def get(self, meetID: str):
+        raw = await self.client.get(self.key(meetID))
+        return json.loads(raw) if raw else None
+
+    async def set(self, meetID: str, data: dict):
+        await self.client.set(self.key(meetID), json.dumps(data), ex=self.ttl)
+
+    async def delete(self, meetID: str):
+        await self.client.delete(self.key(meetID))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def makeStore(url: str = SESSION_STORE_URL):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url, SESSION_STATE_TTL)
+    return MemorySessionStore(SESSION_STATE_TTL)
+
+
+store = makeStore()
+
+
+async def lastQuestion(meetID: str):
+    """The last thing the interviewer said, from the stored transcript."""
+    message = await messages.find_one(
+        {"meet_id": meetID, "sender": "Jarvis"},
+        {"message": 1},
+        sort=[("sentAt", DESCENDING)]
+    )
+    return message["message"] if message else None
+
+
+async def loadState(meetID: str, client_last_response: str | None = None) -> InterviewState:
+    """Resume an interview, preferring server-side state over what the client claims.
+
+    The store wins; without it (expired, or a per-process store on another
+    worker) the last question is recovered from the transcript. The client's
+    lastLLMResponse is used only when neither knows of a question.
+    """
+    try:
+        data = await store.get(meetID)
+    except Exception as e:
+        logger.warning("Session store read failed for meet %s: %s", meetID, e)
+        data = None
+
+    if data:
+        logger.info("Resuming meet %s at turn %s", meetID, data.get("version", 0))
+        return InterviewState.fromDict(meetID, data)
+
+    state = InterviewState(meetID, await lastQuestion(meetID))
+    if not state.last_response:
+        state.last_response = client_last_response
+    return state
+
+
+async def saveState(state: InterviewState):
+    try:
+        await store.set(state.meetID, state.toDict())
+    except Exception as e:
+        # The transcript still has the last question, so a lost write only costs the pending text
+        logger.warning("Session store write failed for meet %s: %s", state.meetID, e)
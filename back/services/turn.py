@@ -0,0 +1,334 @@
+import os
+import asyncio
+import logging
+import contextvars
+from collections import deque
+
+from ai.agents.mainAgent import startAgent, commitQuestion
+from ai.agents.validationAgent import validate
+from ai.agents.followupAgent import followUp
+from back.db.meetState import MeetState
+from back.db.utils.messages import putMessage
+from back.services.frames import FrameWriter
+from ai.scheduler import llmContext, scheduler, LLMBusyError, BUSY_MESSAGE, STREAMING, BACKGROUND
+from back.metrics import span, mark, setOutcome
+
+logger = logging.getLogger(__name__)
+
+# The turn whose task is running, so send helpers can flag the point of no return
+currentTurn = contextvars.ContextVar("current_turn", default=None)
+
+# "pipelined" runs validation, follow-up and next-question generation together;
+# "sequential" keeps the original one-after-another order
+TURN_MODE = os.getenv("TURN_MODE", "pipelined")
+
+
+class QuestionDraft:
+    """Runs `startAgent` in the background and buffers what it streams.
+
+    Nothing is sent or saved until the caller streams the draft and commits
+    it, so a draft can be started before the turn knows it will be needed
+    and cancelled if it is not.
+    """
+
+    def __init__(self, state: MeetState):
+        self.chunks = []
+        self.final = None
+        self.error = None
+        self._changed = asyncio.Event()
+        self.task = asyncio.create_task(self._run(state))
+
+    async def _run(self, state: MeetState):
+        try:
+            async for msg in startAgent(state):
+                if msg["type"] == "chunk":
+                    self.chunks.append(msg["data"])
+                elif msg["type"] == "final":
+                    self.final = msg
+                self._changed.set()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._changed.set()
+
+    async def stream(self):
+        """Yield buffered chunks, then live ones until generation finishes."""
+        sent = 0
+        while True:
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+
+            if self.task.done():
+                # Surface a failed generation to the caller
+                if self.error:
+                    raise self.error
+                return
+
+            self._changed.clear()
+            await self._changed.wait()
+
+    def cancel(self):
+        self.task.cancel()
+
+    @property
+    def usable(self) -> bool:
+        """False once generation has finished without a parsed question."""
+        return not self.task.done() or (self.error is None and self.final is not None)
+
+
+class Lookahead:
+    """Per-session draft of the next question.
+
+    Started as soon as the previous question is sent, so generation overlaps
+    with the candidate speaking. A draft stays valid across follow-ups and
+    failed validations because neither changes the meet; it is regenerated
+    only when the meet state moved on or the draft itself failed.
+    """
+
+    def __init__(self, state: MeetState):
+        self.state = state
+        self.draft = None
+        self.version = None
+
+    def start(self, priority: int = BACKGROUND) -> QuestionDraft:
+        if self.draft and self.version == self.state.version and self.draft.usable:
+            if priority < BACKGROUND:
+                # The candidate is now waiting on this draft
+                scheduler.promote(self.state.meetID, BACKGROUND, priority)
+            return self.draft
+
+        self.discard()
+        with llmContext(priority=priority):
+            self.draft = QuestionDraft(self.state)
+        self.version = self.state.version
+        return self.draft
+
+    def take(self) -> QuestionDraft:
+        """Hand the current (or a fresh) draft to the caller, who now owns it."""
+        draft = self.start(STREAMING)
+        self.draft = None
+        return draft
+
+    def discard(self):
+        if self.draft:
+            self.draft.cancel()
+        self.draft = None
+
+
+class Turn:
+    def __init__(self, args: tuple):
+        self.args = args
+        self.task = None
+        # False until the handler runs; a turn cancelled before that never saw its answer
+        self.started = False
+        # Set once the whole answer has gone out; from then on the turn only persists it
+        self.finishing = False
+
+
+def markFinishing():
+    turn = currentTurn.get()
+    if turn:
+        turn.finishing = True
+
+
+class TurnManager:
+    """Owns the one turn that may be answering on a socket.
+
+    Answers are handled one at a time, in order, by `handler`. A newer
+    answer from the candidate cancels a turn that is still validating or
+    streaming: the cancellation reaches the LLM request, which closes its
+    connection, and the client is told to drop what it received. A turn
+    that already sent its whole answer is left to finish saving it.
+    """
+
+    def __init__(self, frames: FrameWriter, handler):
+        self.frames = frames
+        self.handler = handler
+        self.queue = deque()
+        self.ready = asyncio.Event()
+        self.turn = None
+        self.worker = asyncio.create_task(self._work())
+
+    def submit(self, *args):
+        self.queue.append(args)
+        self.ready.set()
+
+    async def _work(self):
+        while True:
+            while not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+            turn = Turn(self.queue.popleft())
+            turn.task = asyncio.create_task(self._run(turn))
+            self.turn = turn
+            await asyncio.wait([turn.task])
+
+    async def _run(self, turn: Turn):
+        currentTurn.set(turn)
+        turn.started = True
+        await self.handler(*turn.args)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.turn and not self.turn.task.done())
+
+    async def cancel(self) -> list:
+        """Stop the running turn if it can still be taken back.
+
+        Returns the answers whose handler had not started (queued ones, and
+        the current one if it was cancelled before running), so the caller
+        can fold them into the candidate's continuing answer.
+        """
+        queued = list(self.queue)
+        self.queue.clear()
+
+        if self.active and not self.turn.finishing:
+            self.turn.task.cancel()
+            await asyncio.wait([self.turn.task])
+            # Text still buffered for the client belongs to the reply being taken back
+            self.frames.discard()
+            await self.frames.send({"type": "ai_response_cancelled"})
+            queued = self.unstarted() + queued
+        return queued
+
+    async def close(self) -> list:
+        """Stop everything without notifying the (gone) client; returns the answers never started."""
+        queued = list(self.queue)
+        self.queue.clear()
+        self.worker.cancel()
+        if self.active:
+            self.turn.task.cancel()
+            await asyncio.wait([self.turn.task])
+            queued = self.unstarted() + queued
+        return queued
+
+    def unstarted(self) -> list:
+        """The current turn's answer if its handler never ran, e.g. cancelled right after being scheduled."""
+        if self.turn and not self.turn.started:
+            return [self.turn.args]
+        return []
+
+
+async def sendResponse(frames: FrameWriter, text: str):
+    markFinishing()
+    mark("first_chunk")
+    await frames.chunk(text)
+    await frames.send({"type": "ai_response_done"})
+
+
+async def streamDraft(frames: FrameWriter, state: MeetState, draft: QuestionDraft):
+    final_answer = ""
+
+    try:
+        async for chunk in draft.stream():
+            if not final_answer:
+                mark("first_chunk")
+            final_answer += chunk
+            await frames.chunk(chunk)
+        markFinishing()
+    finally:
+        # Only matters if sending failed or the turn was cancelled mid-stream
+        draft.cancel()
+
+    if draft.final:
+        await commitQuestion(state, draft.final)
+        state.followup_asked = False
+
+    await frames.send({"type": "ai_response_done"})
+
+    return final_answer
+
+
+async def runTurn(frames: FrameWriter, state: MeetState, lookahead: Lookahead, last_response: str | None, answer: str):
+    """Answer one finalized user message and return the new last AI response."""
+    try:
+        if TURN_MODE == "sequential":
+            return await runSequentialTurn(frames, state, last_response, answer)
+        return await runPipelinedTurn(frames, state, lookahead, last_response, answer)
+    except LLMBusyError as e:
+        logger.warning("LLM busy, asking candidate to retry: %s", e)
+        setOutcome("busy")
+        await sendResponse(frames, BUSY_MESSAGE)
+        return last_response
+
+
+async def runSequentialTurn(frames: FrameWriter, state: MeetState, last_response: str | None, answer: str):
+    with span("validation"):
+        result = await validate(state, last_response or "", answer)
+    logger.debug("Validation result: %s", result)
+
+    if (result.get("status") or "").lower().strip() != "success":
+        msg = result.get("message", "Validation failed")
+        setOutcome("validation_failed")
+        await sendResponse(frames, msg)
+        return msg
+
+    if last_response and last_response.strip():
+        with span("followup"):
+            followup_result = await followUp(state, last_response, answer)
+        logger.debug("Follow-up result: %s", followup_result)
+
+        if followup_result["status"] == "followup_needed":
+            followup_question = followup_result["message"]
+            setOutcome("followup")
+            putMessage(state.meetID, followup_question, "Jarvis")
+            state.followup_asked = True
+            await sendResponse(frames, followup_question)
+            return followup_question
+
+    with llmContext(priority=STREAMING):
+        draft = QuestionDraft(state)
+    with span("question"):
+        final_answer = await streamDraft(frames, state, draft)
+    setOutcome("question")
+    return final_answer
+
+
+async def runPipelinedTurn(frames: FrameWriter, state: MeetState, lookahead: Lookahead, last_response: str | None, answer: str):
+    # Gates run alongside the look-ahead draft (started when the last question
+    # went out, or now if there is none); only the branch that wins is sent and saved
+    lookahead.start(STREAMING)
+    validation = asyncio.create_task(validate(state, last_response or "", answer))
+    followup = None
+    if last_response and last_response.strip():
+        followup = asyncio.create_task(followUp(state, last_response, answer))
+
+    try:
+        with span("validation"):
+            result = await validation
+        logger.debug("Validation result: %s", result)
+
+        if (result.get("status") or "").lower().strip() != "success":
+            msg = result.get("message", "Validation failed")
+            setOutcome("validation_failed")
+            await sendResponse(frames, msg)
+            return msg
+
+        if followup:
+            # Runs alongside validation, so this only counts the time left after it
+            with span("followup"):
+                followup_result = await followup
+            logger.debug("Follow-up result: %s", followup_result)
+
+            if followup_result["status"] == "followup_needed":
+                followup_question = followup_result["message"]
+                setOutcome("followup")
+                putMessage(state.meetID, followup_question, "Jarvis")
+                state.followup_asked = True
+                await sendResponse(frames, followup_question)
+                return followup_question
+
+        with span("question"):
+            final_answer = await streamDraft(frames, state, lookahead.take())
+        setOutcome("question")
+
+        # Draft the following question while the candidate answers this one
+        lookahead.start()
+        return final_answer
+
+    finally:
+        # Gates that lost (or all of them, if this turn was cancelled) stop here
+        for task in (validation, followup):
+            if task and not task.done():
+                task.cancel()
@@ -1,12 +1,11 @@
-from back.db.welcome import getNameForWelcome
 from back.db.utils.messages import putMessage
 
 s = "I'm Jarvis, your AI interviewer. I'll be guiding you through today's interview. Let's begin."
 
-def sayFirstMessage(session_id: str, meetID: str):
-    name = getNameForWelcome(session_id)
+async def sayFirstMessage(user: dict | None, meetID: str):
+    name = (user or {}).get("name", "Candidate")
     
     message = "Hello " + name + "! " + s
-    # putMessage(meetID, message, "Jarvis")
+    # await putMessage(meetID, message, "Jarvis")
     
     return "Hello there, lets start the interview!"
\ No newline at end of file
@@ -0,0 +1,48 @@
+import logging
+
+from back.logConfig import RateLimitFilter, LOG_RATE_EXEMPT
+from back.metrics import TurnTrace
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_traces_from_every_meet_get_through():
+    handler = Collect()
+    handler.addFilter(RateLimitFilter(20, 10, LOG_RATE_EXEMPT))
+    logger = logging.getLogger("crackem.trace")
+    logger.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        for i in range(30):
+            TurnTrace(f"meet-{i}", 1).finish()
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    assert len(handler.records) == 30
+    assert len({record.getMessage() for record in handler.records}) == 30
+
+
+def test_other_templates_are_still_limited():
+    handler = Collect()
+    handler.addFilter(RateLimitFilter(20, 10, LOG_RATE_EXEMPT))
+    logger = logging.getLogger("crackem.test")
+    logger.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        for i in range(30):
+            logger.info("meet %s", i)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    assert len(handler.records) == 20
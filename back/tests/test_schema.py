@@ -0,0 +1,38 @@
+import os
+import sys
+import uuid
+import subprocess
+
+import pytest
+
+# The explain check needs a real mongod; mongomock has no query planner
+MONGO_URI = os.getenv("MONGO_URI", "")
+if not MONGO_URI or MONGO_URI.startswith("mongomock://"):
+    pytest.skip("needs a live MONGO_URI", allow_module_level=True)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def scratchDB():
+    """A throwaway database name, always set, so the configured database is never touched."""
+    from pymongo import MongoClient
+
+    name = f"CrackEM_schema_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    client = MongoClient(MONGO_URI)
+    client.drop_database(name)
+    client.close()
+
+
+def test_hot_queries_use_an_index(scratchDB):
+    # A separate process, so the app's Mongo client is created against the scratch database
+    result = subprocess.run(
+        [sys.executable, "-m", "back.db.schema", "--check"],
+        cwd=ROOT,
+        env={**os.environ, "MONGO_DB": scratchDB},
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
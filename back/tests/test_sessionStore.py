@@ -0,0 +1,33 @@
+import os
+import json
+import asyncio
+
+# Nothing here reaches Mongo; the store holds the state being resumed
+os.environ.setdefault("MONGO_URI", "mongomock://")
+
+from back.services.sessionStore import InterviewState, loadState, saveState
+from back.db.meetState import MeetState
+from ai.agents.followupAgent import followUp
+
+
+def test_followup_flag_survives_serialization():
+    state = InterviewState("meet-1", "Can you say more about indexes?", 4, "partly", followup_asked=True)
+    restored = InterviewState.fromDict("meet-1", json.loads(json.dumps(state.toDict())))
+    assert restored.followup_asked is True
+    assert restored.last_response == state.last_response
+    assert restored.pending == "partly"
+
+
+def test_no_followup_to_a_followup_after_reconnect():
+    async def reconnect():
+        # First connection: a follow-up was just asked
+        await saveState(InterviewState("meet-2", "What happens when the cache is full?", 5, followup_asked=True))
+
+        # Second connection, as the transcript route sets it up
+        state = await loadState("meet-2")
+        meet_state = MeetState({"meet_id": "meet-2", "question_asked": 4})
+        meet_state.followup_asked = state.followup_asked
+        return await followUp(meet_state, state.last_response, "I am not sure")
+
+    result = asyncio.run(reconnect())
+    assert result["status"] == "no_followup_needed"
@@ -0,0 +1,51 @@
+import os
+import asyncio
+
+os.environ.setdefault("MONGO_URI", "mongomock://")
+
+from back.services.turn import TurnManager
+
+
+class Frames:
+    def __init__(self):
+        self.sent = []
+
+    def discard(self):
+        pass
+
+    async def send(self, frame: dict):
+        self.sent.append(frame)
+
+
+def test_cancel_returns_an_answer_whose_turn_never_started():
+    handled = []
+
+    async def handler(answer, version, waited):
+        handled.append(answer)
+
+    async def scenario():
+        turns = TurnManager(Frames(), handler)
+        turns.submit("first part", 1, 0.0)
+        turns.submit("second part", 2, 0.0)
+        # The worker schedules the first turn, which has not run yet
+        await asyncio.sleep(0)
+        returned = await turns.cancel()
+        await turns.close()
+        return returned
+
+    returned = asyncio.run(scenario())
+    assert handled == []
+    assert [args[0] for args in returned] == ["first part", "second part"]
+
+
+def test_close_returns_an_answer_whose_turn_never_started():
+    async def handler(answer, version, waited):
+        raise AssertionError("handler should not run")
+
+    async def scenario():
+        turns = TurnManager(Frames(), handler)
+        turns.submit("only part", 1, 0.0)
+        await asyncio.sleep(0)
+        return await turns.close()
+
+    assert [args[0] for args in asyncio.run(scenario())] == ["only part"]
@@ -1,4 +1,212 @@
+import os
+import re
+import asyncio
+import logging
+
 from ai.agents.sentenceEnhancer import enhance_sentence
 
-def enhance(text: str) -> str:
-    return enhance_sentence(text)
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+ENHANCE_LLM_ENABLED = os.getenv("ENHANCE_LLM_ENABLED", "true").lower() == "true"
+# Below this confidence the cleaned text is also sent through the LLM pass
+ENHANCE_LLM_THRESHOLD = float(os.getenv("ENHANCE_LLM_THRESHOLD", "0.7"))
+# Speech must pause this long before the LLM pass starts on interim text
+ENHANCE_SPECULATE_DELAY = float(os.getenv("ENHANCE_SPECULATE_DELAY", "0.2"))
+# Longest a turn waits for an LLM pass still running when it commits
+ENHANCE_MAX_WAIT = float(os.getenv("ENHANCE_MAX_WAIT", "0.25"))
+
+# Phrases speech recognition hears instead of technical terms; longer phrases first
+CONFUSIONS = [
+    ("no sequel", "NoSQL"),
+    ("my sequel", "MySQL"),
+    ("post gress sequel", "PostgreSQL"),
+    ("post gress", "Postgres"),
+    ("postgre sequel", "PostgreSQL"),
+    ("sequel", "SQL"),
+    ("java script", "JavaScript"),
+    ("type script", "TypeScript"),
+    ("pie thon", "Python"),
+    ("mongo db", "MongoDB"),
+    ("mango db", "MongoDB"),
+    ("graph ql", "GraphQL"),
+    ("node js", "Node.js"),
+    ("react js", "React"),
+    ("next js", "Next.js"),
+    ("git hub", "GitHub"),
+    ("get hub", "GitHub"),
+    ("c plus plus", "C++"),
+    ("c sharp", "C#"),
+    ("dot net", ".NET"),
+    ("cooper netties", "Kubernetes"),
+    ("cube control", "kubectl"),
+    ("a p i", "API"),
+    ("big o", "Big O"),
+    ("o of n log n", "O(n log n)"),
+    ("o of n squared", "O(n^2)"),
+    ("o of log n", "O(log n)"),
+    ("o of one", "O(1)"),
+    ("o of 1", "O(1)"),
+    ("o of n", "O(n)"),
+    ("hash mat", "hash map"),
+    ("rest api", "REST API"),
+    ("restful", "RESTful"),
+    ("fast api", "FastAPI"),
+]
+
+# Everyday words that are usually a misheard technical term, but only near one of CONTEXT
+CONTEXT_CONFUSIONS = {
+    "cash": "cache",
+    "cashing": "caching",
+    "cashed": "cached",
+    "jason": "JSON",
+    "cue": "queue",
+    "cues": "queues",
+}
+CONTEXT = {
+    "memory", "hit", "miss", "misses", "layer", "redis", "invalidation", "invalidate", "evict",
+    "eviction", "lru", "cpu", "data", "database", "server", "api", "file", "object", "response",
+    "request", "format", "parse", "payload", "endpoint", "endpoints", "fifo", "stack", "push",
+    "pop", "enqueue", "dequeue", "message", "messages", "http", "service", "services", "query",
+    "key", "keys", "value", "browser", "stale", "store", "stored", "ttl", "read", "write", "json",
+}
+
+# Tokens always written as acronyms
+ACRONYMS = {
+    "sql", "api", "apis", "http", "https", "tcp", "udp", "dns", "cpu", "gpu", "ram", "json",
+    "html", "css", "url", "aws", "gcp", "jwt", "oop", "crud", "orm", "sdk", "ui", "ux", "llm",
+    "nlp", "ssd", "ttl", "lru", "fifo", "lifo", "dsa", "bfs", "dfs", "dag", "acid", "cap",
+    "cdn", "vm", "vms", "ci", "cd", "ssl", "tls", "ssh", "mvc", "sla", "rpc", "grpc", "xml",
+}
+# Words with a fixed spelling
+PROPER = {
+    "python": "Python", "java": "Java", "javascript": "JavaScript", "typescript": "TypeScript",
+    "docker": "Docker", "kubernetes": "Kubernetes", "redis": "Redis", "mongodb": "MongoDB",
+    "postgres": "Postgres", "postgresql": "PostgreSQL", "mysql": "MySQL", "linux": "Linux",
+    "react": "React", "django": "Django", "flask": "Flask", "fastapi": "FastAPI",
+    "kafka": "Kafka", "github": "GitHub", "git": "Git", "nosql": "NoSQL", "graphql": "GraphQL",
+    "i": "I", "i'm": "I'm", "i've": "I've", "i'd": "I'd", "i'll": "I'll",
+}
+QUESTION_STARTS = {"what", "why", "how", "when", "where", "who", "which", "can", "could", "should", "would", "is", "are", "do", "does", "did"}
+
+WORD = re.compile(r"[A-Za-z][A-Za-z']*|\S")
+STUTTER = re.compile(r"\b(\w+)( \1\b)+", re.IGNORECASE)
+FILLERS = re.compile(r"\b(um+|uh+|erm|er)\b[,]?\s*", re.IGNORECASE)
+
+
+def _replacePhrase(text: str, phrase: str, replacement: str) -> str:
+    return re.sub(rf"(?<![\w.]){re.escape(phrase)}(?![\w])", replacement, text, flags=re.IGNORECASE)
+
+
+def cleanTranscript(text: str, asr_confidence: float = 1.0):
+    """Deterministic cleanup of a speech transcript; returns (text, confidence).
+
+    Fixes known mishearings of technical terms, stutters, fillers, casing
+    and end punctuation. Confidence starts from the recognizer's and drops
+    for each sign the text may still be wrong, e.g. an ambiguous word left
+    as it was because nothing technical was near it.
+    """
+    confidence = asr_confidence
+    text = " ".join(text.split())
+    if not text:
+        return text, confidence
+
+    for phrase, replacement in CONFUSIONS:
+        text = _replacePhrase(text, phrase, replacement)
+
+    words = set(w.lower() for w in WORD.findall(text))
+    for phrase, replacement in CONTEXT_CONFUSIONS.items():
+        if not re.search(rf"\b{re.escape(phrase)}\b", text, re.IGNORECASE):
+            continue
+        if words & CONTEXT:
+            text = _replacePhrase(text, phrase, replacement)
+        else:
+            confidence *= 0.85
+
+    if STUTTER.search(text):
+        confidence *= 0.9
+        text = STUTTER.sub(r"\1", text)
+    text = FILLERS.sub("", text).strip() or text
+
+    tokens = []
+    for token in text.split(" "):
+        bare = token.lower().rstrip(",.?!")
+        tail = token[len(bare):]
+        if bare in ACRONYMS:
+            token = bare.upper() + tail
+        elif bare in PROPER:
+            token = PROPER[bare] + tail
+        tokens.append(token)
+    text = " ".join(tokens)
+
+    text = text[0].upper() + text[1:]
+    if text[-1] not in ".?!":
+        text += "?" if text.split(" ")[0].lower() in QUESTION_STARTS else "."
+    return text, confidence
+
+
+class TranscriptEnhancer:
+    """Per-session transcript cleanup that stays off the turn's critical path.
+
+    The deterministic pass is microseconds and always runs. When it is
+    unsure, the LLM pass is started speculatively on what the candidate has
+    said so far (final segments plus interim text) once their speech pauses,
+    i.e. while the end-of-turn detector is still deciding. When the turn
+    commits, a finished pass over the same text is used; a slower one gets at
+    most ENHANCE_MAX_WAIT before the deterministic text goes ahead instead.
+    """
+
+    def __init__(self):
+        self.task = None
+        self.source = None
+        self.asr_confidence = 1.0
+        self.stats = {"clean": 0, "llm_used": 0, "llm_late": 0, "llm_started": 0}
+
+    def observe(self, text: str, asr_confidence: float | None = None):
+        """Speech so far in the current answer; called on every interim and final update."""
+        if asr_confidence is not None:
+            self.asr_confidence = min(self.asr_confidence, asr_confidence)
+        if not ENHANCE_LLM_ENABLED:
+            return
+
+        cleaned, confidence = cleanTranscript(text, self.asr_confidence)
+        if confidence >= ENHANCE_LLM_THRESHOLD:
+            self.cancel()
+            return
+        if cleaned == self.source:
+            return
+        self.cancel()
+        self.source = cleaned
+        self.task = asyncio.create_task(self._speculate(cleaned))
+
+    async def _speculate(self, cleaned: str):
+        await asyncio.sleep(ENHANCE_SPECULATE_DELAY)
+        self.stats["llm_started"] += 1
+        return await enhance_sentence(cleaned)
+
+    async def finalize(self, text: str) -> str:
+        """Cleaned text of a committed answer."""
+        cleaned, confidence = cleanTranscript(text, self.asr_confidence)
+        self.asr_confidence = 1.0
+        task, source = self.task, self.source
+        self.task = self.source = None
+
+        if confidence >= ENHANCE_LLM_THRESHOLD or task is None or source != cleaned:
+            if task:
+                task.cancel()
+            self.stats["clean"] += 1
+            return cleaned
+
+        try:
+            result = await asyncio.wait_for(task, ENHANCE_MAX_WAIT)
+            self.stats["llm_used"] += 1
+            return result
+        except asyncio.TimeoutError:
+            self.stats["llm_late"] += 1
+        except Exception as e:
+            logger.debug("LLM enhancement failed: %s", e)
+        return cleaned
+
+    def cancel(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = self.source = None
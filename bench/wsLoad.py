@@ -0,0 +1,310 @@
+"""Load test for the interview WebSocket.
+
+Simulates N candidates against a running backend. Each one signs up and
+signs in, creates a meet, opens /ws/transcript and answers scripted
+questions, sending throttled `interim` messages at speaking pace before
+each final `transcript`, as the frontend does. For every turn it records:
+
+- ttft: final transcript sent -> first `ai_response_chunk`
+- done: final transcript sent -> `ai_response_done`
+- tokens/s: streamed chunks per second between first chunk and done, as
+  the client receives them (a draft buffered ahead of time arrives in a burst)
+- chars/s: the same for streamed text, comparable across `--protocol`
+  choices (coalescing protocols send fewer, larger chunks)
+
+Reports p50/p95/p99 as JSON with a fixed shape, so runs can be diffed
+(`--baseline` prints the change against an earlier report).
+
+Typical run, with no GPU or mongod:
+
+    python -m ai.stubServer
+    MONGO_URI=mongomock:// LLM_BASE_URL=http://127.0.0.1:11435 uvicorn back.main:app
+    python -m bench.wsLoad --sessions 50 --out bench-50.json
+"""
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import httpx
+import websockets
+from websockets.asyncio.client import connect
+
+from ai.scheduler import BUSY_MESSAGE
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ANSWERS = [
+    "Hi, yes I'm ready to begin.",
+    "I'm a backend developer and I've spent about three years building APIs in Python with FastAPI and Postgres.",
+    "I would add an index on the columns used in the where clause so the query planner can avoid a full table scan.",
+    "A process has its own address space while threads share memory inside the same process, which makes context switches cheaper.",
+    "I'd use a sliding window with two pointers and a hash map of counts, which keeps it linear in the length of the input.",
+    "Binary search works on sorted input by halving the range each step, so it runs in logarithmic time.",
+    "TCP uses a congestion window that grows additively and shrinks multiplicatively when it detects packet loss."
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list, p: float):
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(values: list) -> dict:
+    summary = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    summary["mean"] = sum(values) / len(values) if values else None
+    summary["max"] = max(values) if values else None
+    summary["count"] = len(values)
+    return {k: round(v, 2) if isinstance(v, float) else v for k, v in summary.items()}
+
+
+class Candidate:
+    """One simulated interviewee: HTTP setup, then scripted WebSocket turns."""
+
+    def __init__(self, index: int, run_id: str, args):
+        self.index = index
+        self.args = args
+        self.meetID = f"bench-{run_id}-{index}"
+        self.email = f"bench-{run_id}-{index}@example.com"
+        self.password = "bench-password"
+        self.turns = []
+        self.errors = []
+        self.last_response = None
+        self.session_id = None
+        self.messages = asyncio.Queue()
+
+    def error(self, kind: str, detail=""):
+        self.errors.append(kind)
+        if self.args.verbose:
+            print(f"[BENCH] candidate {self.index}: {kind} {detail}", file=sys.stderr, flush=True)
+
+    async def setup(self, http: httpx.AsyncClient) -> bool:
+        await http.post("/user/signup", json={"username": f"Bench {self.index}", "email": self.email, "password": self.password})
+
+        res = await http.post("/user/signin", json={"email": self.email, "password": self.password})
+        if res.json().get("status") != "success" or "session_id" not in http.cookies:
+            self.error("signin", res.text)
+            return False
+
+        res = await http.get("/meet/create", params={"meetID": self.meetID})
+        if res.status_code != 200 or "error" in res.json():
+            self.error("create", res.text)
+            return False
+
+        res = await http.post("/meet/welcome", params={"meetID": self.meetID})
+        self.last_response = res.json().get("message")
+        self.session_id = http.cookies["session_id"]
+        return True
+
+    async def receive(self, ws):
+        try:
+            async for raw in ws:
+                message = msgpack.unpackb(raw) if isinstance(raw, bytes) else json.loads(raw)
+                self.messages.put_nowait((time.perf_counter(), message))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.messages.put_nowait((time.perf_counter(), None))
+
+    async def send(self, ws, kind: str, text: str):
+        await ws.send(json.dumps({"type": kind, "text": text, "lastLLMResponse": self.last_response}))
+
+    async def speak(self, ws, answer: str):
+        """Send growing interim text at the configured speaking rate, then the final transcript."""
+        words = answer.split()
+        seconds_per_word = 60 / self.args.wpm
+        spoken = 0
+        while spoken < len(words):
+            step = max(1, round(self.args.interim_interval / seconds_per_word))
+            spoken = min(len(words), spoken + step)
+            await asyncio.sleep(step * seconds_per_word)
+            await self.send(ws, "interim", " ".join(words[:spoken]))
+        await self.send(ws, "transcript", answer)
+
+    async def awaitResponse(self, sent_at: float):
+        first_chunk, chunks, text = None, 0, ""
+        deadline = sent_at + self.args.response_timeout
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self.error("timeout")
+                return None
+            try:
+                received_at, message = await asyncio.wait_for(self.messages.get(), remaining)
+            except asyncio.TimeoutError:
+                continue
+
+            if message is None:
+                self.error("closed")
+                return None
+            if message.get("type") == "ai_response_chunk":
+                if first_chunk is None:
+                    first_chunk = received_at
+                chunks += 1
+                text += message.get("text", "")
+            elif message.get("type") == "ai_response_done":
+                break
+
+        if text == BUSY_MESSAGE:
+            self.error("busy")
+
+        turn = {
+            "ttft_ms": (first_chunk - sent_at) * 1000 if first_chunk else None,
+            "done_ms": (received_at - sent_at) * 1000,
+            "chunks": chunks,
+            "tokens_per_s": None,
+            "chars_per_s": None
+        }
+        # Single-chunk replies (validation messages, follow-ups) are not streamed
+        if chunks > 1 and received_at > first_chunk:
+            turn["tokens_per_s"] = chunks / (received_at - first_chunk)
+        if first_chunk and received_at > first_chunk and len(text) > 1:
+            turn["chars_per_s"] = len(text) / (received_at - first_chunk)
+
+        self.last_response = text
+        return turn
+
+    async def run(self):
+        try:
+            async with httpx.AsyncClient(base_url=self.args.base_url, timeout=self.args.response_timeout) as http:
+                if not await self.setup(http):
+                    return
+
+            query = urlencode({"meetID": self.meetID, "lastLLMResponse": self.last_response or "", "protocol": self.args.protocol})
+            ws_url = self.args.base_url.replace("http", "ws", 1) + "/ws/transcript?" + query
+            headers = {"Cookie": f"session_id={self.session_id}"}
+            async with connect(ws_url, additional_headers=headers, open_timeout=self.args.response_timeout) as ws:
+                receiver = asyncio.create_task(self.receive(ws))
+                try:
+                    for turn in range(self.args.turns):
+                        await asyncio.sleep(random.uniform(*self.args.think_time))
+                        await self.speak(ws, ANSWERS[turn % len(ANSWERS)])
+                        result = await self.awaitResponse(time.perf_counter())
+                        if result is None:
+                            return
+                        self.turns.append(result)
+                finally:
+                    receiver.cancel()
+
+        except (httpx.HTTPError, OSError, websockets.WebSocketException) as e:
+            self.error("connect", repr(e))
+
+
+async def fetchServerStats(base_url: str):
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=10) as http:
+            return (await http.get("/stats")).json()
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+async def runBenchmark(args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    candidates = [Candidate(i, run_id, args) for i in range(args.sessions)]
+
+    async def start(candidate: Candidate):
+        # Spread arrivals over the ramp so the server is not hit by one burst
+        await asyncio.sleep(args.ramp * candidate.index / max(1, args.sessions))
+        await candidate.run()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(start(c) for c in candidates))
+    wall = time.perf_counter() - started
+
+    turns = [t for c in candidates for t in c.turns]
+    errors = {}
+    for c in candidates:
+        for kind in c.errors:
+            errors[kind] = errors.get(kind, 0) + 1
+
+    return {
+        "label": args.label,
+        "startedAt": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "base_url": args.base_url,
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "ramp": args.ramp,
+            "wpm": args.wpm,
+            "interim_interval": args.interim_interval,
+            "think_time": list(args.think_time),
+            "protocol": args.protocol
+        },
+        "wall_seconds": round(wall, 2),
+        "sessions_completed": sum(1 for c in candidates if len(c.turns) == args.turns),
+        "turns_completed": len(turns),
+        "turns_per_second": round(len(turns) / wall, 2) if wall else None,
+        "ttft_ms": summarize([t["ttft_ms"] for t in turns if t["ttft_ms"] is not None]),
+        "done_ms": summarize([t["done_ms"] for t in turns]),
+        "tokens_per_s": summarize([t["tokens_per_s"] for t in turns if t["tokens_per_s"] is not None]),
+        "chars_per_s": summarize([t["chars_per_s"] for t in turns if t["chars_per_s"] is not None]),
+        "chunks_per_turn": summarize([t["chunks"] for t in turns]),
+        "errors": errors,
+        "server": await fetchServerStats(args.base_url)
+    }
+
+
+def compare(report: dict, baseline: dict):
+    print(f"\nvs {baseline.get('label') or 'baseline'} ({baseline.get('startedAt')})")
+    for metric in ("ttft_ms", "done_ms", "tokens_per_s", "chars_per_s", "chunks_per_turn"):
+        for stat in ("p50", "p95", "p99"):
+            new, old = report.get(metric, {}).get(stat), baseline.get(metric, {}).get(stat)
+            if new is None or not old:
+                continue
+            print(f"  {metric:>13} {stat}: {old:>10.1f} -> {new:>10.1f} ({(new - old) / old * 100:+.1f}%)")
+    old_errors, new_errors = sum(baseline.get("errors", {}).values()), sum(report["errors"].values())
+    print(f"  {'errors':>13}    : {old_errors:>10} -> {new_errors:>10}")
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Load test /ws/transcript with simulated candidates")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated candidates")
+    parser.add_argument("--turns", type=int, default=5, help="answers per candidate")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which candidates join")
+    parser.add_argument("--wpm", type=float, default=150.0, help="speaking rate for interim messages")
+    parser.add_argument("--interim-interval", type=float, default=0.3, help="seconds between interim messages")
+    parser.add_argument("--think-time", type=float, nargs=2, default=(0.5, 2.0), metavar=("MIN", "MAX"),
+                        help="pause before each answer, in seconds")
+    parser.add_argument("--response-timeout", type=float, default=60.0)
+    parser.add_argument("--protocol", choices=("json", "batched", "msgpack"), default="json",
+                        help="server-to-client wire protocol; msgpack needs the msgpack package on both ends")
+    parser.add_argument("--label", default="", help="name stored in the report")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="print each error as it happens")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    report = asyncio.run(runBenchmark(args))
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -146,7 +146,8 @@ export const useSpeechRecognition = (isEnabled: boolean, meetID?: string, onAiRe
       // Create WebSocket connection (include meetID if available)
       // Use a helper to handle reconnect and queueing of outgoing messages.
       const wsUrlBase = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws/transcript';
-      const wsUrl = meetID ? `${wsUrlBase}?meetID=${encodeURIComponent(meetID)}` : wsUrlBase;
+      // protocol=batched: the server coalesces streamed tokens into fewer frames
+      const wsUrl = meetID ? `${wsUrlBase}?meetID=${encodeURIComponent(meetID)}&protocol=batched` : `${wsUrlBase}?protocol=batched`;
 
       const flushQueue = (socket: WebSocket) => {
         while (sendQueueRef.current.length > 0 && socket.readyState === WebSocket.OPEN) {
@@ -224,6 +225,9 @@ export const useSpeechRecognition = (isEnabled: boolean, meetID?: string, onAiRe
                  }
                  // Reset buffer after done
                  aiResponseBufferRef.current = '';
+              } else if (data.type === 'ai_response_cancelled') {
+                 // Candidate kept talking; the backend dropped this reply and will send a new one
+                 aiResponseBufferRef.current = '';
               } else if (data.type === 'ai_response' && data.text) {
                 // Fallback / legacy support
                 console.log('AI response received:', data.text);